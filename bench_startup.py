@@ -0,0 +1,53 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ["chat", "game", "economy_chess", "chat_batch"]
+# modules that must only load on first use
+LAZY = ["openai", "colorama", "numpy", "multiprocessing"]
+
+
+def import_ms(module: str, runs: int):
+    """Median wall time in ms of a fresh interpreter importing `module`, with the bare interpreter start subtracted."""
+
+    def timed(code: str):
+        t_start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return (time.perf_counter() - t_start) * 1000
+
+    base = statistics.median(timed("pass") for _ in range(runs))
+    return statistics.median(timed(f"import {module}") for _ in range(runs)) - base
+
+
+def eager_imports(module: str):
+    code = f"import json, sys, {module}; print(json.dumps([m for m in {LAZY!r} if m in sys.modules]))"
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import time benchmark and lazy import guard for the cli modules")
+    parser.add_argument("--runs", type=int, default=5, help="interpreter launches per measurement")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when any module imports slower than this")
+    parser.add_argument("--module", action="append", help="restrict to the named module(s)")
+    args = parser.parse_args()
+    failed = 0
+    for module in args.module or MODULES:
+        ms = import_ms(module=module, runs=args.runs)
+        eager = eager_imports(module=module)
+        slow = args.max_ms is not None and ms > args.max_ms
+        status = "ok"
+        if eager:
+            status = f"FAIL (loads {', '.join(eager)} at import)"
+        elif slow:
+            status = f"FAIL (over {args.max_ms:.0f} ms)"
+        failed += bool(eager or slow)
+        print(f"{module:<14} {ms:>8.1f} ms  {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
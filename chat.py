@@ -1,7 +1,27 @@
-from time import time
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sqlite3
+import stat
+import sys
+import tempfile
+from array import array
+from collections import OrderedDict, deque
+from time import perf_counter, time
 from enum import StrEnum
-from openai import OpenAI
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable
 from dotenv import load_dotenv
+from instrument import METRICS
+
+# openai pulls in httpx and pydantic and asyncio is slow to load, so both are only imported where used
+if TYPE_CHECKING:
+    import asyncio
+    from openai import AsyncOpenAI, OpenAI
 
 
 class OpenAIModel(StrEnum):
@@ -14,72 +34,762 @@ class OpenAIRole(StrEnum):
     system = "system"
 
 
+# per message framing tokens of the chat format
+MSG_TOKENS = 4
+# context budget used when history is bounded without an explicit budget
+DEFAULT_BUDGET = 32_000
+_encoding = None
+_client = None
+
+
 def ts():
     return int(time())
 
 
+def count_tokens(text: str | None) -> int:
+    """Exact count with tiktoken when installed, otherwise the usual 4 characters per token estimate."""
+    global _encoding
+    if not text:
+        return 0
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except ImportError:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
 class OpenAIMessage:
+    # content is fixed once created, so the token count and chat dict are built once and shared
+    __slots__ = ("role", "content", "time", "_tokens", "_chat")
+
     def __init__(self, role: OpenAIRole, content: str | None = None):
-        self.role = role
+        # plain strings map onto the shared enum members
+        self.role = OpenAIRole(role)
         self.content = content
         self.time = ts()
+        self._tokens: int | None = None
+        self._chat: dict | None = None
+
+    @property
+    def tokens(self) -> int:
+        if self._tokens is None:
+            self._tokens = MSG_TOKENS + count_tokens(self.content)
+        return self._tokens
 
     def to_chat(self) -> dict:
-        return {"role": self.role, "content": self.content}
+        if self._chat is None:
+            self._chat = {"role": self.role, "content": self.content}
+        return self._chat
 
     def to_text(self) -> str:
         return f"[{self.time}] {self.role}:\n{self.content}"
 
+    def to_json(self) -> str:
+        return json.dumps({"role": self.role, "content": self.content, "time": self.time}, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str):
+        data = json.loads(text)
+        message = cls(role=OpenAIRole(data["role"]), content=data.get("content"))
+        message.time = data.get("time", message.time)
+        return message
+
+
+class MessageStore:
+    """Append-only history keeping the newest `keep` messages in memory.
+
+    Older messages spill to an anonymous temp file and are paged back in on access, so the store holds
+    `keep` messages plus one file offset per spilled one. With `keep` unset nothing spills.
+    This only bounds the session if the request context is bounded too: ChatContext keeps its own
+    references to every turn it sends, which is why OpenAIChat always gives it a budget alongside `keep`.
+    """
+
+    def __init__(self, keep: int | None = None):
+        self.keep = keep
+        self.recent: deque[OpenAIMessage] = deque()
+        self.offsets = array("q")
+        self.spill = None
+
+    def append(self, message: OpenAIMessage):
+        self.recent.append(message)
+        if self.keep is not None and len(self.recent) > self.keep:
+            self._spill(self.recent.popleft())
+
+    def _spill(self, message: OpenAIMessage):
+        if self.spill is None:
+            self.spill = tempfile.TemporaryFile()
+        self.spill.seek(0, os.SEEK_END)
+        self.offsets.append(self.spill.tell())
+        self.spill.write(message.to_json().encode() + b"\n")
+
+    def _page(self, i: int):
+        self.spill.seek(self.offsets[i])
+        return OpenAIMessage.from_json(self.spill.readline())
+
+    def __len__(self):
+        return len(self.offsets) + len(self.recent)
+
+    def __getitem__(self, i: int):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("message index out of range")
+        return self._page(i) if i < len(self.offsets) else self.recent[i - len(self.offsets)]
+
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self._page(i)
+        yield from list(self.recent)
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+        self.recent.clear()
+        self.offsets = array("q")
+
+
+class TranscriptWriter:
+    """Append-only jsonl transcript, every line is flushed as written and fsynced in batches."""
+
+    def __init__(self, path: str, sync_every: int = 16, sync_secs: float = 1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_secs = sync_secs
+        self.f = open(path, "a", encoding="utf-8")
+        self.unsynced = 0
+        # start on a fresh line after a torn write
+        if self.f.tell():
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.f.write("\n")
+        self.synced_at = perf_counter()
+
+    def write(self, message: OpenAIMessage):
+        self.f.write(message.to_json() + "\n")
+        self.f.flush()
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every or perf_counter() - self.synced_at >= self.sync_secs:
+            self.sync()
+
+    def sync(self):
+        if self.unsynced:
+            os.fsync(self.f.fileno())
+        self.unsynced = 0
+        self.synced_at = perf_counter()
+
+    def close(self):
+        if not self.f.closed:
+            self.sync()
+            self.f.close()
+
+
+def read_transcript(path: str):
+    """Yield messages from a jsonl transcript line by line, a torn last line from a crash is skipped."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield OpenAIMessage.from_json(line)
+            except (ValueError, KeyError):
+                continue
+
+
+class ChatContext:
+    """Request payload kept under a token budget.
+
+    System messages are pinned ahead of the conversation; the oldest other messages are dropped once the
+    total goes over budget, or folded into a summary message when a `summarize` callback is given.
+    The payload list is appended to and trimmed in place instead of being rebuilt every turn.
+    Without a budget it holds every message and its chat dict for the life of the session, whatever the
+    history store spills, so memory is only flat when a budget is set.
+    """
+
+    def __init__(self, budget: int | None = None, summarize: Callable[[list[OpenAIMessage]], str] | None = None):
+        self.budget = budget
+        self.summarize = summarize
+        self.pinned: list[OpenAIMessage] = []
+        self.turns: list[OpenAIMessage] = []
+        self.summary: OpenAIMessage | None = None
+        self.payload: list[dict] = []
+        self.tokens = 0
+
+    def _head(self):
+        return len(self.pinned) + (self.summary is not None)
+
+    def push(self, message: OpenAIMessage):
+        if message.role == OpenAIRole.system:
+            self.payload.insert(len(self.pinned), message.to_chat())
+            self.pinned.append(message)
+        else:
+            self.payload.append(message.to_chat())
+            self.turns.append(message)
+        self.tokens += message.tokens
+        self.trim()
+
+    def trim(self):
+        if self.budget is None or self.tokens <= self.budget:
+            return
+        # always keep the newest message
+        drop = 0
+        tokens = self.tokens
+        while tokens > self.budget and drop < len(self.turns) - 1:
+            tokens -= self.turns[drop].tokens
+            drop += 1
+        if not drop:
+            return
+        dropped = self.turns[:drop]
+        del self.turns[:drop]
+        del self.payload[self._head() : self._head() + drop]
+        self.tokens = tokens
+        if self.summarize is None:
+            return
+        previous = [self.summary] if self.summary is not None else []
+        summary = OpenAIMessage(role=OpenAIRole.system, content=self.summarize(previous + dropped))
+        if self.summary is not None:
+            self.tokens -= self.summary.tokens
+            self.payload[len(self.pinned)] = summary.to_chat()
+        else:
+            self.payload.insert(len(self.pinned), summary.to_chat())
+        self.summary = summary
+        self.tokens += summary.tokens
+
+
+class CompletionCache:
+    """Replies keyed by a hash of model and request messages: an in-memory LRU over an optional SQLite file.
+
+    Entries older than `ttl` seconds are misses; the file keeps at most `max_rows` entries, least recently used go first.
+    """
+
+    def __init__(self, path: str | None = "chat.cache.sqlite", max_size: int = 1024, max_rows: int = 100_000, ttl: float | None = None):
+        self.max_size = max_size
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.table: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+        self.db: sqlite3.Connection | None = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS completions_used ON completions (used)")
+            self.db.commit()
+
+    @staticmethod
+    def key(model: str, messages: list[dict]) -> str:
+        text = json.dumps([model, messages], ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _expired(self, created: float):
+        return self.ttl is not None and time() - created > self.ttl
+
+    def _remember(self, key: str, content: str, created: float):
+        self.table[key] = (content, created)
+        self.table.move_to_end(key)
+        if len(self.table) > self.max_size:
+            self.table.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        entry = self.table.get(key)
+        if entry is not None and not self._expired(entry[1]):
+            self.table.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.table.pop(key, None)
+        if self.db is not None:
+            row = self.db.execute("SELECT content, created FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None and not self._expired(row[1]):
+                self.db.execute("UPDATE completions SET used = ? WHERE key = ?", (time(), key))
+                self.db.commit()
+                self._remember(key, row[0], row[1])
+                self.hits += 1
+                self.disk_hits += 1
+                return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, content: str):
+        now = time()
+        self._remember(key, content, now)
+        if self.db is None:
+            return
+        self.db.execute("INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)", (key, content, now, now))
+        self.db.execute("DELETE FROM completions WHERE key IN (SELECT key FROM completions ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.max_rows,))
+        self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+def _namespace(data):
+    if isinstance(data, dict):
+        return SimpleNamespace(**{k: _namespace(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return [_namespace(v) for v in data]
+    return data
+
+
+class DaemonResponse(SimpleNamespace):
+    """A daemon reply with attribute access like the openai objects, model_dump gives back the raw dict."""
+
+    def __init__(self, data: dict):
+        super().__init__(**{k: _namespace(v) for k, v in data.items()})
+        self._data = data
+
+    def model_dump(self, **_):
+        return self._data
+
+
+class DaemonClient:
+    """Stand-in for OpenAI that forwards chat completions to the warm client of a running daemon over a unix socket.
+
+    Responses come back as attribute namespaces shaped like the openai response objects.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.chat = self
+        self.completions = self
+
+    def _read(self, f):
+        data = json.loads(f.readline() or '{"error": "daemon closed the connection"}')
+        if "error" in data:
+            raise RuntimeError(f"daemon: {data['error']}")
+        return data
+
+    def _stream(self, sock: socket.socket, f):
+        try:
+            while True:
+                data = self._read(f)
+                if data.get("done"):
+                    return
+                yield DaemonResponse(data)
+        finally:
+            f.close()
+            sock.close()
+
+    def create(self, **kwargs):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        f = sock.makefile("rwb")
+        f.write(json.dumps(kwargs).encode() + b"\n")
+        f.flush()
+        if kwargs.get("stream"):
+            return self._stream(sock, f)
+        try:
+            return DaemonResponse(self._read(f))
+        finally:
+            f.close()
+            sock.close()
+
+
+def daemon_socket() -> str:
+    """$MYCHAT_SOCKET, or mychat.sock in the per-user runtime dir ($XDG_RUNTIME_DIR, else a 0700 dir under the temp dir)."""
+    if os.environ.get("MYCHAT_SOCKET"):
+        # a bare file name would leave serve_daemon an empty dirname to create
+        return os.path.abspath(os.environ["MYCHAT_SOCKET"])
+    run_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"mychat-{os.getuid()}")
+    return os.path.join(run_dir, "mychat.sock")
+
+
+def _private(path: str, mode: int):
+    """Owned by us with exactly `mode`, so no other local user can have planted or opened it."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and stat.S_IMODE(st.st_mode) == mode
+
+
+def _private_dir(path: str):
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not stat.S_IMODE(st.st_mode) & 0o077
+
+
+def default_client():
+    """Process-wide client made on first use, attached to a running daemon when there is one.
+
+    Only a socket owned by us with mode 0600, in a directory only we can use, is trusted.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    path = daemon_socket() if hasattr(socket, "AF_UNIX") else None
+    if path and _private_dir(os.path.dirname(path)) and _private(path, 0o600) and stat.S_ISSOCK(os.lstat(path).st_mode):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+            _client = DaemonClient(path)
+            return _client
+        except OSError:
+            pass
+    from openai import OpenAI
+
+    _client = OpenAI()
+    return _client
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                kwargs = json.loads(line)
+                if kwargs.get("stream"):
+                    for chunk in self.server.client.chat.completions.create(**kwargs):
+                        self.wfile.write(json.dumps(chunk.model_dump(mode="json")).encode() + b"\n")
+                    self.wfile.write(b'{"done": true}\n')
+                else:
+                    resp = self.server.client.chat.completions.create(**kwargs)
+                    self.wfile.write(json.dumps(resp.model_dump(mode="json")).encode() + b"\n")
+            except Exception as e:
+                self.wfile.write(json.dumps({"error": f"{type(e).__name__}: {e}"}).encode() + b"\n")
+            self.wfile.flush()
+
+
+def serve_daemon(path: str | None = None):
+    """Keep one warm, pooled OpenAI client and serve chat completions to CLI invocations over a unix socket."""
+    from openai import OpenAI
+
+    path = path or daemon_socket()
+    run_dir = os.path.dirname(path)
+    if not os.path.exists(run_dir):
+        os.makedirs(run_dir, mode=0o700)
+    if not _private_dir(run_dir):
+        raise RuntimeError(f"socket dir must be ours and closed to other users (0700): {run_dir}")
+    if os.path.lexists(path):
+        if os.lstat(path).st_uid != os.getuid():
+            raise RuntimeError(f"socket path taken by another user: {path}")
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, _DaemonHandler) as server:
+        server.daemon_threads = True
+        server.client = OpenAI()
+        os.chmod(path, 0o600)
+        # exit through the cleanup below on kill as well as on ctrl-c
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
 
 class OpenAIChat:
-    def __init__(self, client: OpenAI):
-        self.client: OpenAI = client
-        self.history: list[OpenAIMessage] = []
+    def __init__(
+        self,
+        client: "OpenAI | DaemonClient | None" = None,
+        budget: int | None = None,
+        summarize: Callable[[list[OpenAIMessage]], str] | None = None,
+        cache: CompletionCache | None = None,
+        keep_history: bool = True,
+        history_keep: int | None = None,
+    ):
+        self._client = client
+        self.cache = cache
+        # with a transcript on disk the full history need not stay in memory
+        self.keep_history = keep_history
+        # in-memory history length, older messages spill to disk
+        self.history_keep = history_keep
+        self.transcript: TranscriptWriter | None = None
+        self.history = MessageStore(keep=history_keep)
+        # bounded history is pointless with an unbounded context holding the same messages
+        if budget is None and (history_keep is not None or not keep_history):
+            budget = DEFAULT_BUDGET
+        self.budget = budget
+        self.summarize = summarize
+        self.context = ChatContext(budget=budget, summarize=summarize)
         self.model: OpenAIModel | None = None
+        # seconds to the first content delta and to the end of the last streamed reply
+        self.last_ttft: float | None = None
+        self.last_latency: float | None = None
 
-    def start(self, model: OpenAIModel):
-        self.history = []
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = default_client()
+        return self._client
+
+    def start(self, model: OpenAIModel, transcript: str | None = None):
+        self.history.close()
+        self.history = MessageStore(keep=self.history_keep)
+        self.context = ChatContext(budget=self.budget, summarize=self.summarize)
         self.model = model
+        if self.transcript is not None:
+            self.transcript.close()
+        self.transcript = TranscriptWriter(transcript) if transcript is not None else None
+
+    def resume(self, path: str, model: OpenAIModel):
+        """Reload a transcript and keep appending to it."""
+        self.start(model=model)
+        for message in read_transcript(path):
+            self._add(message)
+        self.transcript = TranscriptWriter(path)
+
+    def _add(self, message: OpenAIMessage):
+        if self.keep_history:
+            self.history.append(message)
+        self.context.push(message)
 
     def push(self, message: OpenAIMessage):
-        self.history.append(message)
+        self._add(message)
+        if self.transcript is not None:
+            self.transcript.write(message)
 
     def send(self, message: OpenAIMessage):
         if self.model is None:
             raise RuntimeError("must define a model")
-        self.history.append(message)
-        resp = self.client.chat.completions.create(model=self.model, messages=[m.to_chat() for m in self.history])
-        resp_text = resp.choices[0].message.content
+        self.push(message)
+        key = self.cache.key(self.model, self.context.payload) if self.cache is not None else None
+        resp_text = self.cache.get(key) if key is not None else None
+        if resp_text is None:
+            with METRICS.track(source="chat", model=self.model) as call:
+                resp = self.client.chat.completions.create(model=self.model, messages=self.context.payload)
+                call.usage(resp.usage)
+            resp_text = resp.choices[0].message.content
+            if key is not None and resp_text is not None:
+                self.cache.put(key, resp_text)
         chat_message = OpenAIMessage(role=OpenAIRole.assistant, content=resp_text)
-        self.history.append(chat_message)
+        self.push(chat_message)
         return chat_message
 
+    def send_stream(self, message: OpenAIMessage):
+        """Yield reply content deltas as they arrive, the assembled reply joins history once the stream ends."""
+        if self.model is None:
+            raise RuntimeError("must define a model")
+        self.push(message)
+        self.last_ttft = self.last_latency = None
+        t_start = perf_counter()
+        key = self.cache.key(self.model, self.context.payload) if self.cache is not None else None
+        cached = self.cache.get(key) if key is not None else None
+        parts: list[str] = []
+        if cached is not None:
+            # a cached reply arrives as a single delta
+            self.last_ttft = perf_counter() - t_start
+            parts.append(cached)
+            yield cached
+        else:
+            with METRICS.track(source="chat", model=self.model) as call:
+                stream = self.client.chat.completions.create(model=self.model, messages=self.context.payload, stream=True, stream_options={"include_usage": True})
+                for chunk in stream:
+                    # usage rides on a final chunk without choices
+                    call.usage(chunk.usage)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if self.last_ttft is None:
+                        self.last_ttft = perf_counter() - t_start
+                        call.first_token()
+                    parts.append(delta)
+                    yield delta
+        self.last_latency = perf_counter() - t_start
+        if key is not None and cached is None:
+            self.cache.put(key, "".join(parts))
+        chat_message = OpenAIMessage(role=OpenAIRole.assistant, content="".join(parts))
+        self.push(chat_message)
+
     def end(self, dump: bool = False):
-        if not dump:
+        if self.transcript is not None:
+            self.transcript.close()
+            self.transcript = None
+        if not dump or not self.history:
             return
         with open(f"{ts()}.chat.log", "w") as f:
-            f.write("\n\n".join([m.to_text() for m in self.history]))
+            for i, m in enumerate(self.history):
+                f.write(("\n\n" if i else "") + m.to_text())
+
+
+class SessionClosedError(RuntimeError): ...
+
+
+class AsyncOpenAIChat:
+    """One conversation on a shared async client; requests run one at a time per session and under the service-wide limit.
+
+    Each request runs in its own task, so closing the session cancels the request and the caller gets
+    SessionClosedError instead of being cancelled itself. History and payload are bounded the same way
+    as OpenAIChat, a long-lived session sends the budgeted context rather than every message so far.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncOpenAI",
+        limit: "asyncio.Semaphore",
+        model: OpenAIModel,
+        budget: int | None = DEFAULT_BUDGET,
+        history_keep: int | None = None,
+    ):
+        import asyncio
+
+        self.client = client
+        self.limit = limit
+        self.model = model
+        self.history = MessageStore(keep=history_keep)
+        self.context = ChatContext(budget=budget)
+        self.lock = asyncio.Lock()
+        self.tasks: "set[asyncio.Task]" = set()
+        self.closed = False
+
+    def push(self, message: OpenAIMessage):
+        self.history.append(message)
+        self.context.push(message)
+
+    async def _request(self, messages: list[dict]):
+        async with self.limit:
+            with METRICS.track(source="chat_async", model=self.model) as call:
+                resp = await self.client.chat.completions.create(model=self.model, messages=messages)
+                call.usage(resp.usage)
+        return resp
+
+    async def send(self, message: OpenAIMessage):
+        import asyncio
+
+        async with self.lock:
+            if self.closed:
+                raise SessionClosedError("session closed")
+            # the new message is pushed only once answered, so the request gets a copy with it on the end
+            messages = self.context.payload + [message.to_chat()]
+            request = asyncio.create_task(self._request(messages))
+            self.tasks.add(request)
+            try:
+                resp = await request
+            except asyncio.CancelledError:
+                request.cancel()
+                # our own caller being cancelled propagates, a closed session does not
+                if asyncio.current_task().cancelling():
+                    raise
+                raise SessionClosedError("session closed") from None
+            finally:
+                self.tasks.discard(request)
+            chat_message = OpenAIMessage(role=OpenAIRole.assistant, content=resp.choices[0].message.content)
+            # both sides join history together, so a cancelled send leaves it untouched
+            self.push(message)
+            self.push(chat_message)
+            return chat_message
+
+    def cancel(self):
+        """Cancel in-flight requests and refuse new ones, returns the cancelled tasks for awaiting."""
+        self.closed = True
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        return tasks
+
+
+class ChatService:
+    """Many concurrent sessions over one pooled AsyncOpenAI client."""
+
+    def __init__(
+        self,
+        client: "AsyncOpenAI | None" = None,
+        model: OpenAIModel = OpenAIModel.gpt_4o_mini,
+        max_concurrency: int = 64,
+        budget: int | None = DEFAULT_BUDGET,
+        history_keep: int | None = None,
+    ):
+        import asyncio
+
+        # the client's keep-alive pool is shared by every session, the semaphore bounds requests in flight
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI()
+        self.client = client
+        self.model = model
+        self.budget = budget
+        self.history_keep = history_keep
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.sessions: dict[str, AsyncOpenAIChat] = {}
+        self.cancelled: "set[asyncio.Task]" = set()
+
+    def open(self, session_id: str, system: str | None = None):
+        if session_id in self.sessions:
+            raise KeyError(f"session already open: {session_id}")
+        session = AsyncOpenAIChat(client=self.client, limit=self.limit, model=self.model, budget=self.budget, history_keep=self.history_keep)
+        if system:
+            session.push(OpenAIMessage(role=OpenAIRole.system, content=system))
+        self.sessions[session_id] = session
+        return session
+
+    async def send(self, session_id: str, content: str):
+        return await self.sessions[session_id].send(OpenAIMessage(role=OpenAIRole.user, content=content))
+
+    def close(self, session_id: str):
+        session = self.sessions.pop(session_id)
+        for task in session.cancel():
+            # finished tasks leave the set on their own, so a long-running service does not collect them
+            task.add_done_callback(self.cancelled.discard)
+            self.cancelled.add(task)
+        return session
+
+    async def aclose(self):
+        import asyncio
+
+        for session_id in list(self.sessions):
+            self.close(session_id)
+        # let cancelled requests unwind before their connections go away
+        await asyncio.gather(*self.cancelled, return_exceptions=True)
+        self.cancelled.clear()
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="terminal chat")
+    parser.add_argument("--resume", default=None, help="jsonl transcript to reload and continue")
+    parser.add_argument("--serve", action="store_true", help="run the warm client daemon on $MYCHAT_SOCKET or the per-user runtime dir, later launches attach to it")
+    parser.add_argument("--metrics", default=None, help="write model call metrics here on exit, prometheus text for .prom, json otherwise")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="context token budget, older turns are dropped past it")
+    parser.add_argument("--history-keep", type=int, default=256, help="messages kept in memory, older ones spill to disk")
+    args = parser.parse_args()
     load_dotenv()
+    if args.serve:
+        serve_daemon()
+        return
     dump_on_end = True
-    chat = OpenAIChat(OpenAI())
-    chat.start(model=OpenAIModel.gpt_4o_mini)
-    system_input = input("system message:\n")
-    if system_input:
-        chat.push(OpenAIMessage(role=OpenAIRole.system, content=system_input))
-    print("\n\n")
-    while True:
-        user_input = input("user message:\n")
-        print("\n\n")
-        if user_input:
-            user_message = OpenAIMessage(role=OpenAIRole.user, content=user_input)
-            chat_message = chat.send(user_message)
-            print(f"assistant message:\n{chat_message.content}\n\n")
+    # the client is made on the first send, after the prompts are up
+    chat = OpenAIChat(budget=args.budget, history_keep=args.history_keep)
+    try:
+        if args.resume:
+            chat.resume(path=args.resume, model=OpenAIModel.gpt_4o_mini)
+            for m in chat.history:
+                print(m.to_text(), end="\n\n")
         else:
-            chat.end(dump=dump_on_end)
-            break
+            chat.start(model=OpenAIModel.gpt_4o_mini, transcript=f"{ts()}.chat.jsonl")
+            system_input = input("system message:\n")
+            if system_input:
+                chat.push(OpenAIMessage(role=OpenAIRole.system, content=system_input))
+            print("\n\n")
+        while True:
+            user_input = input("user message:\n")
+            print("\n\n")
+            if not user_input:
+                break
+            user_message = OpenAIMessage(role=OpenAIRole.user, content=user_input)
+            print("assistant message:")
+            for delta in chat.send_stream(user_message):
+                print(delta, end="", flush=True)
+            print(f"\n({chat.last_ttft or 0:.2f}s to first token, {chat.last_latency:.2f}s total)\n\n")
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        chat.end(dump=dump_on_end)
+        if args.metrics:
+            METRICS.dump(args.metrics)
 
 
 if __name__ == "__main__":
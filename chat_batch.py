@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from dotenv import load_dotenv
+from chat import OpenAIChat, OpenAIMessage, OpenAIModel, OpenAIRole, count_tokens, MSG_TOKENS
+from instrument import METRICS
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+class TokenBucket:
+    """Thread-safe bucket refilled at `rate` units per second up to `capacity`, acquire blocks until enough are available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, n: float = 1.0):
+        # a request bigger than the bucket waits for a full bucket instead of forever
+        n = min(n, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.level >= n:
+                    self.level -= n
+                    return
+                wait = (n - self.level) / self.rate
+            time.sleep(wait)
+
+
+def read_conversations(path: str, skip: set[int] | None = None):
+    """Yield (line number, record) for every non-empty line of a jsonl file, records are {"messages": [...]} or {"prompt": "..."}."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for i, line in enumerate(f, start=1):
+            line = line.strip()
+            if line and not (skip and i in skip):
+                yield i, line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def load_checkpoint(path: str):
+    """Input lines already answered in an output file, a torn last line from an interrupted run is cut off."""
+    done: set[int] = set()
+    if not os.path.exists(path):
+        return done
+    good = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)["line"])
+            except (ValueError, KeyError):
+                break
+            good += len(line)
+    if good != os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(good)
+    return done
+
+
+def _retryable(e: Exception):
+    from openai import APIConnectionError, APIStatusError
+
+    return isinstance(e, APIConnectionError) or (isinstance(e, APIStatusError) and (e.status_code == 429 or e.status_code >= 500))
+
+
+def _retry_after(e: Exception):
+    from openai import APIStatusError
+
+    if not isinstance(e, APIStatusError):
+        return None
+    try:
+        return float(e.response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def run_one(
+    client: "OpenAI",
+    model: OpenAIModel,
+    line_no: int,
+    record: str,
+    requests: TokenBucket | None,
+    tokens: TokenBucket | None,
+    reply_tokens: int,
+    retries: int,
+    backoff: float,
+    backoff_max: float,
+):
+    result = {"line": line_no}
+    try:
+        data = json.loads(record)
+        messages = [OpenAIMessage(role=OpenAIRole(m["role"]), content=m.get("content")) for m in data["messages"]] if "messages" in data else [OpenAIMessage(role=OpenAIRole.user, content=data["prompt"])]
+    except (ValueError, KeyError, TypeError) as e:
+        result["error"] = f"bad record: {e}"
+        return result
+    if "id" in data:
+        result["id"] = data["id"]
+    cost = sum(m.tokens for m in messages) + MSG_TOKENS + reply_tokens
+    t_start = time.perf_counter()
+    for attempt in range(retries + 1):
+        if requests is not None:
+            requests.acquire()
+        if tokens is not None:
+            tokens.acquire(cost)
+        # a fresh chat per attempt so a failed send leaves nothing behind
+        chat = OpenAIChat(client)
+        chat.start(model=model)
+        for m in messages[:-1]:
+            chat.push(m)
+        try:
+            reply = chat.send(messages[-1])
+        except Exception as e:
+            if not _retryable(e) or attempt == retries:
+                result["error"] = f"{type(e).__name__}: {e}"
+                break
+            METRICS.retry(source="chat", model=model)
+            delay = _retry_after(e)
+            time.sleep(delay if delay is not None else random.uniform(0, min(backoff_max, backoff * 2**attempt)))
+            continue
+        result["reply"] = reply.content
+        result["reply_tokens"] = count_tokens(reply.content)
+        break
+    result["attempts"] = attempt + 1
+    result["secs"] = time.perf_counter() - t_start
+    return result
+
+
+def run_batch(
+    path: str,
+    out_path: str,
+    client: "OpenAI",
+    model: OpenAIModel,
+    workers: int,
+    inflight: int,
+    rpm: float | None,
+    tpm: float | None,
+    reply_tokens: int = 256,
+    retries: int = 6,
+    backoff: float = 0.5,
+    backoff_max: float = 30.0,
+):
+    """Send every conversation on a thread pool under request and token rate limits, appending results in input order.
+
+    Lines already present in the output file are skipped, so an interrupted run picks up where it stopped.
+    """
+    done = load_checkpoint(out_path)
+    # a bucket holds at most one second worth of quota, which keeps bursts from tripping the provider's limiter
+    requests = TokenBucket(rate=rpm / 60, capacity=max(1.0, rpm / 60)) if rpm else None
+    tokens = TokenBucket(rate=tpm / 60, capacity=max(tpm / 60, reply_tokens)) if tpm else None
+    written = 0
+    pending = deque()
+    with open(out_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+
+        def write(result: dict):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+
+        for line_no, record in read_conversations(path, skip=done):
+            pending.append(pool.submit(run_one, client, model, line_no, record, requests, tokens, reply_tokens, retries, backoff, backoff_max))
+            if len(pending) >= inflight:
+                write(pending.popleft().result())
+                written += 1
+        while pending:
+            write(pending.popleft().result())
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bulk chat runner: jsonl conversations in, jsonl replies out")
+    parser.add_argument("input", help="jsonl conversations, - for stdin")
+    parser.add_argument("--output", required=True, help="jsonl results, appended to and resumed from")
+    parser.add_argument("--model", default=OpenAIModel.gpt_4o_mini, type=OpenAIModel, help="model name")
+    parser.add_argument("--workers", type=int, default=16, help="concurrent requests")
+    parser.add_argument("--inflight", type=int, default=None, help="maximum conversations queued at once (default 4 per worker)")
+    parser.add_argument("--rpm", type=float, default=None, help="requests per minute limit")
+    parser.add_argument("--tpm", type=float, default=None, help="tokens per minute limit")
+    parser.add_argument("--reply-tokens", type=int, default=256, help="reply size assumed when charging the token limit")
+    parser.add_argument("--retries", type=int, default=6, help="retries on 429, 5xx and connection errors")
+    parser.add_argument("--base-url", default=None, help="api base url, e.g. a local mock endpoint")
+    parser.add_argument("--metrics", default=None, help="write model call metrics here, prometheus text for .prom, json otherwise")
+    args = parser.parse_args()
+    load_dotenv()
+    from openai import OpenAI
+
+    # retries are ours, with jitter and shared rate limits
+    client = OpenAI(base_url=args.base_url, max_retries=0) if args.base_url else OpenAI(max_retries=0)
+    t_start = time.perf_counter()
+    written = run_batch(
+        path=args.input,
+        out_path=args.output,
+        client=client,
+        model=args.model,
+        workers=args.workers,
+        inflight=args.inflight or 4 * args.workers,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        reply_tokens=args.reply_tokens,
+        retries=args.retries,
+    )
+    secs = time.perf_counter() - t_start
+    print(f"{written} conversations in {secs:.1f}s ({written / max(secs, 1e-9):.1f}/s)", file=sys.stderr)
+    if args.metrics:
+        METRICS.dump(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+from array import array
 from enum import IntEnum
+import os
+import random
 import string
+import time
 
 
 DIR_N = (-1, 0)
@@ -17,6 +21,25 @@ DIRS_DGNL: list[tuple[int, int]] = [DIR_NE, DIR_SE, DIR_SW, DIR_NW]
 
 BRD_SIZE = 8
 
+BB_FULL = (1 << (BRD_SIZE * BRD_SIZE)) - 1
+BB_ROWS = [((1 << BRD_SIZE) - 1) << (r * BRD_SIZE) for r in range(BRD_SIZE)]
+BB_COLS = [sum(1 << (r * BRD_SIZE + c) for r in range(BRD_SIZE)) for c in range(BRD_SIZE)]
+# columns that stay on the board after a horizontal shift by the key offset
+BB_KEEP = {c_off: sum(BB_COLS[c] for c in range(BRD_SIZE) if 0 <= c - c_off < BRD_SIZE) for c_off in range(-2, 3)}
+
+
+def bb_shift(bb: int, r_off: int, c_off: int):
+    off = r_off * BRD_SIZE + c_off
+    bb = (bb << off) & BB_FULL if off >= 0 else bb >> -off
+    return bb & BB_KEEP[c_off]
+
+
+def bb_squares(bb: int):
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
 
 class PieceType(IntEnum):
     BLANK = 0
@@ -33,6 +56,51 @@ class Color(IntEnum):
     BLACK = -1
 
 
+def _step_table(dirs: list[tuple[int, int]]):
+    table: list[list[tuple[int, int]]] = []
+    for sq in range(BRD_SIZE * BRD_SIZE):
+        r, c = divmod(sq, BRD_SIZE)
+        table.append([(r + r_off, c + c_off) for r_off, c_off in dirs if 0 <= r + r_off < BRD_SIZE and 0 <= c + c_off < BRD_SIZE])
+    return table
+
+
+def _ray_table(r_off: int, c_off: int):
+    table: list[list[tuple[int, int]]] = []
+    for sq in range(BRD_SIZE * BRD_SIZE):
+        r, c = divmod(sq, BRD_SIZE)
+        ray: list[tuple[int, int]] = []
+        while 0 <= r + r_off < BRD_SIZE and 0 <= c + c_off < BRD_SIZE:
+            r += r_off
+            c += c_off
+            ray.append((r, c))
+        table.append(ray)
+    return table
+
+
+def _bb_table(table: list[list[tuple[int, int]]]):
+    return [sum(1 << (r * BRD_SIZE + c) for r, c in tgts) for tgts in table]
+
+
+# per-square target squares, indexed by row * BRD_SIZE + col
+TGTS_KNGT = _step_table(DIRS_KNGT)
+TGTS_KING = _step_table(DIRS_RKFL + DIRS_DGNL)
+TGTS_PAWN = {Color.WHITE: _step_table([DIR_SW, DIR_SE]), Color.BLACK: _step_table([DIR_NW, DIR_NE])}
+RAYS = {d: _ray_table(*d) for d in DIRS_RKFL + DIRS_DGNL}
+RAYS_RKFL = [[RAYS[d][sq] for d in DIRS_RKFL if RAYS[d][sq]] for sq in range(BRD_SIZE * BRD_SIZE)]
+RAYS_DGNL = [[RAYS[d][sq] for d in DIRS_DGNL if RAYS[d][sq]] for sq in range(BRD_SIZE * BRD_SIZE)]
+RAYS_QUEN = [RAYS_RKFL[sq] + RAYS_DGNL[sq] for sq in range(BRD_SIZE * BRD_SIZE)]
+
+BB_KNGT = _bb_table(TGTS_KNGT)
+BB_KING = _bb_table(TGTS_KING)
+BB_RAYS = {d: _bb_table(RAYS[d]) for d in RAYS}
+
+# fixed seed keeps keys identical across runs and processes
+_zbr_rng = random.Random(0x2B992DDFA232)
+ZBR_PIECE = {p * s: [_zbr_rng.getrandbits(64) for _ in range(BRD_SIZE * BRD_SIZE)] for p in PieceType if p for s in Color}
+ZBR_ENP = [_zbr_rng.getrandbits(64) for _ in range(BRD_SIZE * BRD_SIZE)]
+ZBR_BLACK = _zbr_rng.getrandbits(64)
+
+
 """
 ◼◻
 ♔♕♖♗♘♙
@@ -55,6 +123,121 @@ PIECE_UI = {
 }
 
 
+PIECE_VALUE = {
+    PieceType.BLANK: 0,
+    PieceType.KING: 20000,
+    PieceType.QUEEN: 900,
+    PieceType.ROOK: 500,
+    PieceType.BISHOP: 330,
+    PieceType.KNIGHT: 320,
+    PieceType.PAWN: 100,
+}
+FEN_PIECES = {
+    "k": PieceType.KING,
+    "q": PieceType.QUEEN,
+    "r": PieceType.ROOK,
+    "b": PieceType.BISHOP,
+    "n": PieceType.KNIGHT,
+    "p": PieceType.PAWN,
+}
+# piece-square bonuses for white, listed from the 8th rank down as on a diagram
+PIECE_SQUARE = {
+    PieceType.KING: [
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-20, -30, -30, -40, -40, -30, -30, -20],
+        [-10, -20, -20, -20, -20, -20, -20, -10],
+        [20, 20, 0, 0, 0, 0, 20, 20],
+        [20, 30, 10, 0, 0, 10, 30, 20],
+    ],
+    PieceType.QUEEN: [
+        [-20, -10, -10, -5, -5, -10, -10, -20],
+        [-10, 0, 0, 0, 0, 0, 0, -10],
+        [-10, 0, 5, 5, 5, 5, 0, -10],
+        [-5, 0, 5, 5, 5, 5, 0, -5],
+        [0, 0, 5, 5, 5, 5, 0, -5],
+        [-10, 5, 5, 5, 5, 5, 0, -10],
+        [-10, 0, 5, 0, 0, 0, 0, -10],
+        [-20, -10, -10, -5, -5, -10, -10, -20],
+    ],
+    PieceType.ROOK: [
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [5, 10, 10, 10, 10, 10, 10, 5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [0, 0, 0, 5, 5, 0, 0, 0],
+    ],
+    PieceType.BISHOP: [
+        [-20, -10, -10, -10, -10, -10, -10, -20],
+        [-10, 0, 0, 0, 0, 0, 0, -10],
+        [-10, 0, 5, 10, 10, 5, 0, -10],
+        [-10, 5, 5, 10, 10, 5, 5, -10],
+        [-10, 0, 10, 10, 10, 10, 0, -10],
+        [-10, 10, 10, 10, 10, 10, 10, -10],
+        [-10, 5, 0, 0, 0, 0, 5, -10],
+        [-20, -10, -10, -10, -10, -10, -10, -20],
+    ],
+    PieceType.KNIGHT: [
+        [-50, -40, -30, -30, -30, -30, -40, -50],
+        [-40, -20, 0, 0, 0, 0, -20, -40],
+        [-30, 0, 10, 15, 15, 10, 0, -30],
+        [-30, 5, 15, 20, 20, 15, 5, -30],
+        [-30, 0, 15, 20, 20, 15, 0, -30],
+        [-30, 5, 10, 15, 15, 10, 5, -30],
+        [-40, -20, 0, 5, 5, 0, -20, -40],
+        [-50, -40, -30, -30, -30, -30, -40, -50],
+    ],
+    PieceType.PAWN: [
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [50, 50, 50, 50, 50, 50, 50, 50],
+        [10, 10, 20, 30, 30, 20, 10, 10],
+        [5, 5, 10, 25, 25, 10, 5, 5],
+        [0, 0, 0, 20, 20, 0, 0, 0],
+        [5, -5, -10, 0, 0, -10, -5, 5],
+        [5, 10, 10, -20, -20, 10, 10, 5],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+}
+
+
+def _psqt_table():
+    table = {PieceType.BLANK: [0] * (BRD_SIZE * BRD_SIZE)}
+    for p, rows in PIECE_SQUARE.items():
+        # black reads the diagram upside down
+        table[p] = [PIECE_VALUE[p] + rows[BRD_SIZE - 1 - sq // BRD_SIZE][sq % BRD_SIZE] for sq in range(BRD_SIZE * BRD_SIZE)]
+        table[-p] = [-(PIECE_VALUE[p] + rows[sq // BRD_SIZE][sq % BRD_SIZE]) for sq in range(BRD_SIZE * BRD_SIZE)]
+    return table
+
+
+# signed piece -> per-square material plus piece-square score, white positive
+PSQT = _psqt_table()
+MATE_SCORE = 1000000
+MATE_BOUND = MATE_SCORE - 1000
+
+
+def evaluate_board(board: list[list[PieceType]]):
+    """Material plus piece-square score of a board, positive favours white."""
+    score = 0
+    for r in range(BRD_SIZE):
+        for c in range(BRD_SIZE):
+            score += PSQT[board[r][c]][r * BRD_SIZE + c]
+    return score
+
+
+def evaluate_batch(boards):
+    """Score an (N, 8, 8) int8 array of boards in one vectorized pass, same values as evaluate_board."""
+    import numpy as np
+
+    boards = np.asarray(boards, dtype=np.int8).reshape(-1, BRD_SIZE * BRD_SIZE)
+    table = np.array([PSQT[p] for p in range(-PieceType.PAWN, PieceType.PAWN + 1)], dtype=np.int32)
+    return table[boards.astype(np.intp) + PieceType.PAWN, np.arange(BRD_SIZE * BRD_SIZE)].sum(axis=1)
+
+
 def get_standard_board():
     board = [[PieceType.BLANK for _ in range(BRD_SIZE)] for _ in range(BRD_SIZE)]
     board[7] = [-1 * p for p in [PieceType.ROOK, PieceType.KNIGHT, PieceType.BISHOP, PieceType.QUEEN, PieceType.KING, PieceType.BISHOP, PieceType.KNIGHT, PieceType.ROOK]]
@@ -64,7 +247,17 @@ def get_standard_board():
     return board
 
 
+# moves are packed ints: source square in bits 0-5, target in 6-11, captured square in 12-17, then flags
+MV_SQ = 0x3F
+MV_TGT = 6
+MV_CAP = 12
+MV_CAPT = 1 << 18
+MV_JUMP = 1 << 19
+
+
 class GameMove:
+    __slots__ = ("src_row", "src_col", "tgt_row", "tgt_col", "cap_row", "cap_col")
+
     def __init__(self, src_row: int, src_col: int, tgt_row: int, tgt_col: int, cap_row: int | None = None, cap_col: int | None = None):
         self.src_row = src_row
         self.src_col = src_col
@@ -74,6 +267,50 @@ class GameMove:
         self.cap_col = cap_col
 
 
+def move_unpack(move: int):
+    src_r, src_c = divmod(move & MV_SQ, BRD_SIZE)
+    tgt_r, tgt_c = divmod(move >> MV_TGT & MV_SQ, BRD_SIZE)
+    if not move & MV_CAPT:
+        return GameMove(src_row=src_r, src_col=src_c, tgt_row=tgt_r, tgt_col=tgt_c)
+    cap_r, cap_c = divmod(move >> MV_CAP & MV_SQ, BRD_SIZE)
+    return GameMove(src_row=src_r, src_col=src_c, tgt_row=tgt_r, tgt_col=tgt_c, cap_row=cap_r, cap_col=cap_c)
+
+
+class GameBits:
+    """One bitboard per signed piece type plus per-color occupancy, square = row * BRD_SIZE + col."""
+
+    def __init__(self, board: list[list[PieceType]]):
+        self.pieces: dict[int, int] = {p * s: 0 for p in PieceType if p for s in Color}
+        self.occ: dict[int, int] = {s: 0 for s in Color}
+        for r in range(BRD_SIZE):
+            for c in range(BRD_SIZE):
+                if board[r][c]:
+                    self.put(sq=r * BRD_SIZE + c, piece=board[r][c])
+
+    def put(self, sq: int, piece: int):
+        bit = 1 << sq
+        self.pieces[piece] |= bit
+        self.occ[Color.WHITE if piece > 0 else Color.BLACK] |= bit
+
+    def drop(self, sq: int, piece: int):
+        bit = ~(1 << sq)
+        self.pieces[piece] &= bit
+        self.occ[Color.WHITE if piece > 0 else Color.BLACK] &= bit
+
+
+def zobrist_key(board: list[list[PieceType]], color: Color, enp_r: int | None = None, enp_c: int | None = None):
+    key = 0
+    for r in range(BRD_SIZE):
+        for c in range(BRD_SIZE):
+            if board[r][c]:
+                key ^= ZBR_PIECE[board[r][c]][r * BRD_SIZE + c]
+    if enp_r is not None and enp_c is not None:
+        key ^= ZBR_ENP[enp_r * BRD_SIZE + enp_c]
+    if color == Color.BLACK:
+        key ^= ZBR_BLACK
+    return key
+
+
 class GameState:
     def __init__(
         self,
@@ -81,18 +318,140 @@ class GameState:
         color: Color,
         enp_r: int | None = None,
         enp_c: int | None = None,
-        lmove: GameMove | None = None,
+        lmove: int | None = None,
+        bits: GameBits | None = None,
     ):
+        # the list-of-lists board is always kept current, bitboards are optional and mirror it
         self.board = board
         self.color = color
         self.enp_r = enp_r
         self.enp_c = enp_c
         self.lmove = lmove
+        self.bits = bits
+        self.key = zobrist_key(board=board, color=color, enp_r=enp_r, enp_c=enp_c)
+        # material plus piece-square score, white positive, kept current by GameEngine
+        self.score = evaluate_board(board=board)
+
+
+def parse_fen(fen: str):
+    """Build a GameState from a FEN or EPD record; castling rights and move counters are ignored."""
+    fields = fen.split()
+    if len(fields) < 2:
+        raise ValueError(f"invalid fen: {fen!r}")
+    ranks = fields[0].split("/")
+    if len(ranks) != BRD_SIZE:
+        raise ValueError(f"invalid fen placement: {fields[0]!r}")
+    board = [[PieceType.BLANK for _ in range(BRD_SIZE)] for _ in range(BRD_SIZE)]
+    for i, rank in enumerate(ranks):
+        r = BRD_SIZE - 1 - i
+        c = 0
+        for ch in rank:
+            if ch.isdigit():
+                c += int(ch)
+                continue
+            if ch.lower() not in FEN_PIECES or c >= BRD_SIZE:
+                raise ValueError(f"invalid fen placement: {fields[0]!r}")
+            board[r][c] = FEN_PIECES[ch.lower()] if ch.isupper() else -FEN_PIECES[ch.lower()]
+            c += 1
+        if c != BRD_SIZE:
+            raise ValueError(f"invalid fen placement: {fields[0]!r}")
+    if fields[1] not in ("w", "b"):
+        raise ValueError(f"invalid fen side to move: {fields[1]!r}")
+    color = Color.WHITE if fields[1] == "w" else Color.BLACK
+    enp_r = enp_c = None
+    if len(fields) > 3 and fields[3] != "-":
+        enp = fields[3]
+        # the target sits behind a pawn of the side not to move that has just made a double step
+        if len(enp) != 2 or enp[0] not in string.ascii_lowercase[:BRD_SIZE] or enp[1] != ("6" if color == Color.WHITE else "3"):
+            raise ValueError(f"invalid fen en-passant square: {enp!r}")
+        enp_r, enp_c = int(enp[1]) - 1, string.ascii_lowercase.index(enp[0])
+        if board[enp_r][enp_c] != PieceType.BLANK or board[enp_r - color][enp_c] != -color * PieceType.PAWN:
+            raise ValueError(f"invalid fen en-passant square: {enp!r}")
+    return GameState(board=board, color=color, enp_r=enp_r, enp_c=enp_c)
+
+
+def dump_fen(state: GameState):
+    pieces = {p: ch for ch, p in FEN_PIECES.items()}
+    ranks: list[str] = []
+    for r in reversed(range(BRD_SIZE)):
+        rank = ""
+        blanks = 0
+        for p in state.board[r]:
+            if not p:
+                blanks += 1
+                continue
+            if blanks:
+                rank += str(blanks)
+                blanks = 0
+            rank += pieces[abs(p)].upper() if p > 0 else pieces[abs(p)]
+        ranks.append(rank + (str(blanks) if blanks else ""))
+    color = "w" if state.color == Color.WHITE else "b"
+    enp = "-"
+    if state.enp_r is not None and state.enp_c is not None:
+        enp = f"{string.ascii_lowercase[state.enp_c]}{state.enp_r + 1}"
+    return f"{'/'.join(ranks)} {color} - {enp} 0 1"
+
+
+class TableFlag(IntEnum):
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+class TransTable:
+    """Fixed-size transposition table held in two flat arrays, so memory never exceeds size_mb.
+
+    With policy "depth" every bucket has a depth-preferred slot and an always-replace slot,
+    with policy "always" every bucket is a single always-replace slot.
+    Entries pack score (32 bits), move (22 bits, 0 = none), depth (8 bits) and flag (2 bits).
+    """
+
+    ENTRY_BYTES = 16
+
+    def __init__(self, size_mb: int = 16, policy: str = "depth"):
+        if policy not in ("depth", "always"):
+            raise ValueError(f"unknown replacement policy: {policy}")
+        self.policy = policy
+        self.ways = 2 if policy == "depth" else 1
+        self.size = max(self.ways, size_mb * 2**20 // self.ENTRY_BYTES // self.ways * self.ways)
+        self.keys = array("Q", bytes(8 * self.size))
+        self.data = array("q", bytes(8 * self.size))
+
+    def clear(self):
+        self.keys = array("Q", bytes(8 * self.size))
+        self.data = array("q", bytes(8 * self.size))
+
+    def probe(self, key: int):
+        idx = key % (self.size // self.ways) * self.ways
+        for i in range(idx, idx + self.ways):
+            if self.keys[i] == key:
+                data = self.data[i]
+                return (data >> 2) & 0xFF, TableFlag(data & 0x3), data >> 32, (data >> 10) & 0x3FFFFF
+        return None
+
+    def store(self, key: int, depth: int, flag: TableFlag, score: int, move: int = 0):
+        idx = key % (self.size // self.ways) * self.ways
+        if self.ways == 2:
+            if self.keys[idx + 1] == key:
+                idx += 1
+            elif self.keys[idx] != key and depth < (self.data[idx] >> 2) & 0xFF:
+                # keep the deeper entry in the first slot, shallower results go to the second
+                idx += 1
+        self.keys[idx] = key
+        self.data[idx] = (score << 32) | (move << 10) | (min(depth, 0xFF) << 2) | flag
 
 
 class GameEngine:
-    def __init__(self, state: GameState):
+    def __init__(self, state: GameState, bitboards: bool = False):
         self.state = state
+        # (move, captured piece, enp_r, enp_c, lmove, key) per made move
+        self.undo: list[tuple[int, int, int | None, int | None, int | None, int]] = []
+        # updated by legal_moves
+        self.is_check = False
+        self.is_mate = False
+        self.is_stalemate = False
+        if bitboards and state.bits is None:
+            state.bits = GameBits(board=state.board)
 
     def _is_blank(self, row: int, col: int):
         return not self.state.board[row][col]
@@ -105,65 +464,53 @@ class GameEngine:
     def _is_valid(self, row: int, col: int):
         return row in range(BRD_SIZE) and col in range(BRD_SIZE)
 
-    def _step_moves(self, row: int, col: int, dirs: list[tuple[int, int]]):
-        moves: list[GameMove] = []
-        for r_off, c_off in dirs:
-            tgt_row = row + r_off
-            tgt_col = col + c_off
-            tgt_valid = self._is_valid(row=tgt_row, col=tgt_col)
-            if not tgt_valid:
-                continue
-            tgt_enemy = self._is_enemy(row=tgt_row, col=tgt_col)
-            tgt_blank = self._is_blank(row=tgt_row, col=tgt_col)
-            if tgt_blank or tgt_enemy:
-                m = GameMove(src_row=row, src_col=col, tgt_row=tgt_row, tgt_col=tgt_col)
-                if tgt_enemy:
-                    m.cap_row = tgt_row
-                    m.cap_col = tgt_col
-                moves.append(m)
+    def _step_moves(self, row: int, col: int, tgts: list[tuple[int, int]]):
+        moves: list[int] = []
+        src = row * BRD_SIZE + col
+        for tgt_row, tgt_col in tgts:
+            if self._is_blank(row=tgt_row, col=tgt_col):
+                moves.append(src | (tgt_row * BRD_SIZE + tgt_col) << MV_TGT)
+            elif self._is_enemy(row=tgt_row, col=tgt_col):
+                tgt = tgt_row * BRD_SIZE + tgt_col
+                moves.append(src | tgt << MV_TGT | tgt << MV_CAP | MV_CAPT)
         return moves
 
-    def _slide_moves(self, row: int, col: int, dirs: list[tuple[int, int]]):
-        moves: list[GameMove] = []
-        for r_off, c_off in dirs:
-            nxt_r = row + r_off
-            nxt_c = col + c_off
-            while self._is_valid(row=nxt_r, col=nxt_c):
-                tgt_enemy = self._is_enemy(row=nxt_r, col=nxt_c)
-                tgt_blank = self._is_blank(row=nxt_r, col=nxt_c)
-                m = GameMove(src_row=row, src_col=col, tgt_row=nxt_r, tgt_col=nxt_c)
-                if tgt_blank or tgt_enemy:
-                    if tgt_enemy:
-                        m.cap_row = nxt_r
-                        m.cap_col = nxt_c
-                    moves.append(m)
-                if tgt_enemy or not tgt_blank:
-                    break
-                nxt_r += r_off
-                nxt_c += c_off
+    def _slide_moves(self, row: int, col: int, rays: list[list[tuple[int, int]]]):
+        moves: list[int] = []
+        src = row * BRD_SIZE + col
+        for ray in rays:
+            for nxt_r, nxt_c in ray:
+                if self._is_blank(row=nxt_r, col=nxt_c):
+                    moves.append(src | (nxt_r * BRD_SIZE + nxt_c) << MV_TGT)
+                    continue
+                if self._is_enemy(row=nxt_r, col=nxt_c):
+                    tgt = nxt_r * BRD_SIZE + nxt_c
+                    moves.append(src | tgt << MV_TGT | tgt << MV_CAP | MV_CAPT)
+                break
         return moves
 
     def _king_moves(self, row: int, col: int):
-        return self._step_moves(row=row, col=col, dirs=DIRS_RKFL + DIRS_DGNL)
+        return self._step_moves(row=row, col=col, tgts=TGTS_KING[row * BRD_SIZE + col])
 
     def _queen_moves(self, row: int, col: int):
-        return self._slide_moves(row=row, col=col, dirs=DIRS_RKFL + DIRS_DGNL)
+        return self._slide_moves(row=row, col=col, rays=RAYS_QUEN[row * BRD_SIZE + col])
 
     def _rook_moves(self, row: int, col: int):
-        return self._slide_moves(row=row, col=col, dirs=DIRS_RKFL)
+        return self._slide_moves(row=row, col=col, rays=RAYS_RKFL[row * BRD_SIZE + col])
 
     def _bishop_moves(self, row: int, col: int):
-        return self._slide_moves(row=row, col=col, dirs=DIRS_DGNL)
+        return self._slide_moves(row=row, col=col, rays=RAYS_DGNL[row * BRD_SIZE + col])
 
     def _knight_moves(self, row: int, col: int):
-        return self._step_moves(row=row, col=col, dirs=DIRS_KNGT)
+        return self._step_moves(row=row, col=col, tgts=TGTS_KNGT[row * BRD_SIZE + col])
 
     def _pawn_jumps(self, row: int, col: int):
-        moves: list[GameMove] = []
+        moves: list[int] = []
         is_first = self.state.color == Color.WHITE and row == 1 or self.state.color == Color.BLACK and row == 6
         step_dir = DIR_S if self.state.color == Color.WHITE else DIR_N
         step_tot = 2 if is_first else 1
         step_ind = 1
+        src = row * BRD_SIZE + col
         while step_ind <= step_tot:
             nxt_r = row + (step_dir[0] * step_ind)
             nxt_c = col + (step_dir[1] * step_ind)
@@ -171,57 +518,97 @@ class GameEngine:
                 break
             if not self._is_blank(row=nxt_r, col=nxt_c):
                 break
-            moves.append(
-                GameMove(
-                    src_row=row,
-                    src_col=col,
-                    tgt_row=nxt_r,
-                    tgt_col=nxt_c,
-                )
-            )
+            moves.append(src | (nxt_r * BRD_SIZE + nxt_c) << MV_TGT | (MV_JUMP if step_ind == 2 else 0))
             step_ind += 1
         return moves
 
     def _pawn_capts(self, row: int, col: int):
-        moves: list[GameMove] = []
-        dirs = [DIR_SW, DIR_SE] if self.state.color == Color.WHITE else [DIR_NW, DIR_NE]
-        for r_off, c_off in dirs:
-            nxt_r = row + r_off
-            nxt_c = col + c_off
-            if not self._is_valid(row=nxt_r, col=nxt_c):
-                continue
-            enp_m = nxt_r == self.state.enp_r and nxt_c == self.state.enp_c
-            cpt_m = self._is_enemy(row=nxt_r, col=nxt_c)
-            if not enp_m and not cpt_m:
-                continue
-            lst_m = self.state.last_move
-            if enp_m:
-                tgt_r = self.state.enp_r
-                tgt_c = self.state.enp_c
-                cap_r = lst_m.tgt_row
-                cap_c = lst_m.tgt_col
-            else:
-                tgt_r = cap_r = nxt_r
-                tgt_c = cap_c = nxt_c
-            move = GameMove(
-                src_row=row,
-                src_col=col,
-                tgt_row=tgt_r,
-                tgt_col=tgt_c,
-                cap_row=cap_r,
-                cap_col=cap_c,
-            )
-            moves.append(move)
+        moves: list[int] = []
+        src = row * BRD_SIZE + col
+        for nxt_r, nxt_c in TGTS_PAWN[self.state.color][src]:
+            tgt = nxt_r * BRD_SIZE + nxt_c
+            if nxt_r == self.state.enp_r and nxt_c == self.state.enp_c:
+                # the passed pawn sits one row behind the en-passant square
+                cap = (nxt_r - self.state.color) * BRD_SIZE + nxt_c
+                moves.append(src | tgt << MV_TGT | cap << MV_CAP | MV_CAPT)
+            elif self._is_enemy(row=nxt_r, col=nxt_c):
+                moves.append(src | tgt << MV_TGT | tgt << MV_CAP | MV_CAPT)
         return moves
 
     def _pawn_moves(self, row: int, col: int):
-        moves: list[GameMove] = []
+        moves: list[int] = []
         moves += self._pawn_jumps(row=row, col=col)
         moves += self._pawn_capts(row=row, col=col)
         return moves
 
-    def _pseudo_legal_moves(self) -> list[GameMove]:
-        moves: list[GameMove] = []
+    def _bits_moves(self, src: int, tgts: int, enemy: int):
+        moves: list[int] = []
+        for tgt in bb_squares(tgts):
+            if enemy >> tgt & 1:
+                moves.append(src | tgt << MV_TGT | tgt << MV_CAP | MV_CAPT)
+            else:
+                moves.append(src | tgt << MV_TGT)
+        return moves
+
+    def _bits_slides(self, src: int, dirs: list[tuple[int, int]], occ: int):
+        tgts = 0
+        for r_off, c_off in dirs:
+            ray = BB_RAYS[(r_off, c_off)][src]
+            blk = ray & occ
+            if blk:
+                # cut the ray behind the nearest blocker
+                if r_off * BRD_SIZE + c_off > 0:
+                    blk_sq = (blk & -blk).bit_length() - 1
+                else:
+                    blk_sq = blk.bit_length() - 1
+                ray ^= BB_RAYS[(r_off, c_off)][blk_sq]
+            tgts |= ray
+        return tgts
+
+    def _bits_pawn_moves(self, pawns: int, blank: int, enemy: int):
+        moves: list[int] = []
+        r_off = DIR_S[0] if self.state.color == Color.WHITE else DIR_N[0]
+        jump_row = 2 if self.state.color == Color.WHITE else BRD_SIZE - 3
+        step = bb_shift(pawns, r_off, 0) & blank
+        jump = bb_shift(step & BB_ROWS[jump_row], r_off, 0) & blank
+        for tgt in bb_squares(step):
+            moves.append(tgt - r_off * BRD_SIZE | tgt << MV_TGT)
+        for tgt in bb_squares(jump):
+            moves.append(tgt - 2 * r_off * BRD_SIZE | tgt << MV_TGT | MV_JUMP)
+        enp = 0
+        if self.state.enp_r is not None and self.state.enp_c is not None:
+            enp = 1 << (self.state.enp_r * BRD_SIZE + self.state.enp_c)
+        for c_off in (-1, 1):
+            for tgt in bb_squares(bb_shift(pawns, r_off, c_off) & (enemy | enp)):
+                # the pawn taken en passant sits one row behind the passed square
+                cap = tgt if enemy >> tgt & 1 else tgt - r_off * BRD_SIZE
+                moves.append(tgt - r_off * BRD_SIZE - c_off | tgt << MV_TGT | cap << MV_CAP | MV_CAPT)
+        return moves
+
+    def _bits_pseudo_legal_moves(self) -> list[int]:
+        moves: list[int] = []
+        bits = self.state.bits
+        color = self.state.color
+        own = bits.occ[color]
+        enemy = bits.occ[-color]
+        occ = own | enemy
+        for src in bb_squares(bits.pieces[color * PieceType.KING]):
+            moves += self._bits_moves(src=src, tgts=BB_KING[src] & ~own, enemy=enemy)
+        for src in bb_squares(bits.pieces[color * PieceType.QUEEN]):
+            moves += self._bits_moves(src=src, tgts=self._bits_slides(src=src, dirs=DIRS_RKFL + DIRS_DGNL, occ=occ) & ~own, enemy=enemy)
+        for src in bb_squares(bits.pieces[color * PieceType.ROOK]):
+            moves += self._bits_moves(src=src, tgts=self._bits_slides(src=src, dirs=DIRS_RKFL, occ=occ) & ~own, enemy=enemy)
+        for src in bb_squares(bits.pieces[color * PieceType.BISHOP]):
+            moves += self._bits_moves(src=src, tgts=self._bits_slides(src=src, dirs=DIRS_DGNL, occ=occ) & ~own, enemy=enemy)
+        for src in bb_squares(bits.pieces[color * PieceType.KNIGHT]):
+            moves += self._bits_moves(src=src, tgts=BB_KNGT[src] & ~own, enemy=enemy)
+        moves += self._bits_pawn_moves(pawns=bits.pieces[color * PieceType.PAWN], blank=~occ & BB_FULL, enemy=enemy)
+        return moves
+
+    def _pseudo_legal_moves(self) -> list[int]:
+        if self.state.bits is not None:
+            return self._bits_pseudo_legal_moves()
+        moves: list[int] = []
         for r in range(BRD_SIZE):
             for c in range(BRD_SIZE):
                 s_enemy = self._is_enemy(row=r, col=c)
@@ -243,30 +630,422 @@ class GameEngine:
                         moves += self._pawn_moves(row=r, col=c)
         return moves
 
-    def _is_pawn_jump(self, move: GameMove):
-        piece = self.state.board[move.src_row][move.src_col]
-        is_pawn = abs(piece) == PieceType.PAWN
-        is_jump = abs(move.src_row - move.tgt_row) == 2
-        if is_pawn and is_jump:
-            return True
-        return False
-
-    def make_move(self, move: GameMove):
-        src_r, src_c = move.src_row, move.src_col
-        tgt_r, tgt_c = move.tgt_row, move.tgt_col
-        cap_r, cap_c = move.cap_row, move.cap_col
-        if cap_r is not None and cap_c is not None:
-            self.state.board[cap_r][cap_c] = PieceType.BLANK
-        if self._is_pawn_jump(move):
-            self.state.enp_r = (move.src_row + move.tgt_row) // 2
-            self.state.enp_c = move.src_col
+    def make_move(self, move: int):
+        src = move & MV_SQ
+        tgt = move >> MV_TGT & MV_SQ
+        src_r, src_c = divmod(src, BRD_SIZE)
+        tgt_r, tgt_c = divmod(tgt, BRD_SIZE)
+        board = self.state.board
+        bits = self.state.bits
+        key = self.state.key ^ ZBR_BLACK
+        cap_p = PieceType.BLANK
+        if move & MV_CAPT:
+            cap = move >> MV_CAP & MV_SQ
+            cap_r, cap_c = divmod(cap, BRD_SIZE)
+            cap_p = board[cap_r][cap_c]
+            if bits is not None:
+                bits.drop(sq=cap, piece=cap_p)
+            board[cap_r][cap_c] = PieceType.BLANK
+            key ^= ZBR_PIECE[cap_p][cap]
+            self.state.score -= PSQT[cap_p][cap]
+        self.undo.append((move, cap_p, self.state.enp_r, self.state.enp_c, self.state.lmove, self.state.key))
+        if self.state.enp_r is not None and self.state.enp_c is not None:
+            key ^= ZBR_ENP[self.state.enp_r * BRD_SIZE + self.state.enp_c]
+        if move & MV_JUMP:
+            self.state.enp_r, self.state.enp_c = divmod((src + tgt) // 2, BRD_SIZE)
+            key ^= ZBR_ENP[(src + tgt) // 2]
         else:
             self.state.enp_r = self.state.enp_c = None
-        move_piece = self.state.board[src_r][src_c]
-        self.state.board[tgt_r][tgt_c] = move_piece
-        self.state.board[src_r][src_c] = PieceType.BLANK
+        move_piece = board[src_r][src_c]
+        key ^= ZBR_PIECE[move_piece][src] ^ ZBR_PIECE[move_piece][tgt]
+        self.state.key = key
+        self.state.score += PSQT[move_piece][tgt] - PSQT[move_piece][src]
+        if bits is not None:
+            bits.drop(sq=src, piece=move_piece)
+            bits.put(sq=tgt, piece=move_piece)
+        board[tgt_r][tgt_c] = move_piece
+        board[src_r][src_c] = PieceType.BLANK
+        self.state.color *= -1
+        self.state.lmove = move
+
+    def unmake_move(self):
+        move, cap_p, enp_r, enp_c, lmove, key = self.undo.pop()
+        src = move & MV_SQ
+        tgt = move >> MV_TGT & MV_SQ
+        src_r, src_c = divmod(src, BRD_SIZE)
+        tgt_r, tgt_c = divmod(tgt, BRD_SIZE)
+        board = self.state.board
+        bits = self.state.bits
+        move_piece = board[tgt_r][tgt_c]
+        if bits is not None:
+            bits.drop(sq=tgt, piece=move_piece)
+            bits.put(sq=src, piece=move_piece)
+        board[tgt_r][tgt_c] = PieceType.BLANK
+        board[src_r][src_c] = move_piece
+        self.state.score -= PSQT[move_piece][tgt] - PSQT[move_piece][src]
+        if move & MV_CAPT:
+            cap = move >> MV_CAP & MV_SQ
+            if bits is not None:
+                bits.put(sq=cap, piece=cap_p)
+            board[cap // BRD_SIZE][cap % BRD_SIZE] = cap_p
+            self.state.score += PSQT[cap_p][cap]
+        self.state.enp_r = enp_r
+        self.state.enp_c = enp_c
+        self.state.lmove = lmove
+        self.state.key = key
         self.state.color *= -1
-        self.state.last_move = move
+        return move
+
+    def _king_square(self, color: int):
+        if self.state.bits is not None:
+            kings = self.state.bits.pieces[color * PieceType.KING]
+            return kings.bit_length() - 1 if kings else None
+        for r in range(BRD_SIZE):
+            for c in range(BRD_SIZE):
+                if self.state.board[r][c] == color * PieceType.KING:
+                    return r * BRD_SIZE + c
+        return None
+
+    def _is_attacked(self, sq: int, by: int):
+        board = self.state.board
+        for r, c in TGTS_KNGT[sq]:
+            if board[r][c] == by * PieceType.KNIGHT:
+                return True
+        for r, c in TGTS_KING[sq]:
+            if board[r][c] == by * PieceType.KING:
+                return True
+        for r, c in TGTS_PAWN[-by][sq]:
+            if board[r][c] == by * PieceType.PAWN:
+                return True
+        for rays, slider in ((RAYS_RKFL[sq], by * PieceType.ROOK), (RAYS_DGNL[sq], by * PieceType.BISHOP)):
+            for ray in rays:
+                for r, c in ray:
+                    p = board[r][c]
+                    if p:
+                        if p == slider or p == by * PieceType.QUEEN:
+                            return True
+                        break
+        return False
+
+    def _checks_and_pins(self, ksq: int):
+        """Squares that resolve a check (None when not in check), number of checkers, and the squares each pinned piece may move to."""
+        board = self.state.board
+        color = self.state.color
+        checks: set[int] | None = None
+        checkers = 0
+        pins: dict[int, set[int]] = {}
+        for r, c in TGTS_KNGT[ksq]:
+            if board[r][c] == -color * PieceType.KNIGHT:
+                checks = {r * BRD_SIZE + c}
+                checkers += 1
+        for r, c in TGTS_PAWN[color][ksq]:
+            if board[r][c] == -color * PieceType.PAWN:
+                checks = {r * BRD_SIZE + c}
+                checkers += 1
+        rays = [(ray, -color * PieceType.ROOK) for ray in RAYS_RKFL[ksq]] + [(ray, -color * PieceType.BISHOP) for ray in RAYS_DGNL[ksq]]
+        for ray, slider in rays:
+            line: set[int] = set()
+            own = None
+            for r, c in ray:
+                sq = r * BRD_SIZE + c
+                line.add(sq)
+                p = board[r][c]
+                if not p:
+                    continue
+                if p * color > 0:
+                    if own is not None:
+                        break
+                    own = sq
+                    continue
+                if p == slider or p == -color * PieceType.QUEEN:
+                    if own is None:
+                        checks = line
+                        checkers += 1
+                    else:
+                        pins[own] = line
+                break
+        return checks, checkers, pins
+
+    def legal_moves(self) -> list[int]:
+        """Pseudo-legal moves that do not leave the own king attacked; also sets is_check, is_mate and is_stalemate."""
+        moves = self._pseudo_legal_moves()
+        color = self.state.color
+        ksq = self._king_square(color)
+        if ksq is None:
+            self.is_check = self.is_mate = self.is_stalemate = False
+            return moves
+        checks, checkers, pins = self._checks_and_pins(ksq)
+        board = self.state.board
+        k_r, k_c = divmod(ksq, BRD_SIZE)
+        legal: list[int] = []
+        for m in moves:
+            src = m & MV_SQ
+            tgt = m >> MV_TGT & MV_SQ
+            if src == ksq:
+                # lift the king so sliders see through its current square
+                board[k_r][k_c] = PieceType.BLANK
+                safe = not self._is_attacked(tgt, by=-color)
+                board[k_r][k_c] = color * PieceType.KING
+                if safe:
+                    legal.append(m)
+                continue
+            if checkers > 1:
+                continue
+            if m & MV_CAPT and m >> MV_CAP & MV_SQ != tgt:
+                # en passant clears two squares on one line, test it by playing it out
+                self.make_move(m)
+                safe = not self._is_attacked(ksq, by=-color)
+                self.unmake_move()
+                if safe:
+                    legal.append(m)
+                continue
+            if checks is not None and tgt not in checks:
+                continue
+            if src in pins and tgt not in pins[src]:
+                continue
+            legal.append(m)
+        self.is_check = checks is not None
+        self.is_mate = self.is_check and not legal
+        self.is_stalemate = not self.is_check and not legal
+        return legal
+
+    def evaluate(self):
+        return self.state.score * self.state.color
+
+
+class SearchTimeout(Exception): ...
+
+
+class SearchResult:
+    def __init__(self, move: int | None, score: int, pv: list[int], depth: int, nodes: int, secs: float):
+        self.move = move
+        self.score = score
+        self.pv = pv
+        self.depth = depth
+        self.nodes = nodes
+        self.secs = secs
+
+    @property
+    def nps(self):
+        return self.nodes / self.secs if self.secs > 0 else 0.0
+
+
+class GameSearch:
+    """Negamax alpha-beta over legal moves with iterative deepening, transposition table,
+    MVV-LVA / killer / history move ordering and capture quiescence."""
+
+    MAX_PLY = 128
+    TIME_CHECK = 1024
+
+    def __init__(self, engine: GameEngine, table: TransTable | None = None):
+        self.engine = engine
+        self.table = table if table is not None else TransTable()
+        self.killers: list[list[int]] = [[0, 0] for _ in range(self.MAX_PLY)]
+        self.history: dict[int, int] = {}
+        self.pv: list[list[int]] = [[] for _ in range(self.MAX_PLY + 1)]
+        self.nodes = 0
+        self.deadline: float | None = None
+
+    def _tick(self):
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes % self.TIME_CHECK and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def _order(self, moves: list[int], ply: int, tt_move: int = 0):
+        board = self.engine.state.board
+        killers = self.killers[ply] if ply < self.MAX_PLY else [0, 0]
+
+        def rank(m: int):
+            if m == tt_move:
+                return 1 << 30
+            if m & MV_CAPT:
+                # most valuable victim first, least valuable attacker breaks ties
+                cap = m >> MV_CAP & MV_SQ
+                src = m & MV_SQ
+                victim = abs(board[cap // BRD_SIZE][cap % BRD_SIZE])
+                attacker = abs(board[src // BRD_SIZE][src % BRD_SIZE])
+                return (1 << 29) + (PieceType.PAWN - victim) * 8 + attacker
+            if m == killers[0]:
+                return (1 << 28) + 1
+            if m == killers[1]:
+                return 1 << 28
+            return self.history.get(m, 0)
+
+        moves.sort(key=rank, reverse=True)
+        return moves
+
+    def _quiesce(self, alpha: int, beta: int, ply: int):
+        self._tick()
+        if ply >= self.MAX_PLY:
+            return self.engine.evaluate()
+        moves = self.engine.legal_moves()
+        if self.engine.is_check:
+            # no standing pat while in check, every evasion is searched
+            if not moves:
+                return -MATE_SCORE + ply
+            best = -MATE_SCORE - 1
+        else:
+            if not moves:
+                return 0
+            best = self.engine.evaluate()
+            if best >= beta:
+                return best
+            alpha = max(alpha, best)
+            moves = [m for m in moves if m & MV_CAPT]
+        for m in self._order(moves, ply=ply):
+            self.engine.make_move(m)
+            score = -self._quiesce(-beta, -alpha, ply + 1)
+            self.engine.unmake_move()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int):
+        self.pv[ply] = []
+        if depth <= 0 or ply >= self.MAX_PLY:
+            return self._quiesce(alpha, beta, ply)
+        self._tick()
+        key = self.engine.state.key
+        tt_move = 0
+        entry = self.table.probe(key)
+        if entry is not None:
+            e_depth, e_flag, e_score, tt_move = entry
+            # only same-depth hits cut off, so a fixed-depth search returns the same value whatever the table holds
+            if e_depth == depth:
+                # mate scores are stored relative to the node, not the root
+                e_score = e_score - ply if e_score > MATE_BOUND else e_score + ply if e_score < -MATE_BOUND else e_score
+                if e_flag == TableFlag.EXACT or (e_flag == TableFlag.LOWER and e_score >= beta) or (e_flag == TableFlag.UPPER and e_score <= alpha):
+                    return e_score
+        moves = self.engine.legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if self.engine.is_check else 0
+        alpha_orig = alpha
+        best = -MATE_SCORE - 1
+        best_move = 0
+        for m in self._order(moves, ply=ply, tt_move=tt_move):
+            self.engine.make_move(m)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            self.engine.unmake_move()
+            if score > best:
+                best = score
+                best_move = m
+                if score > alpha:
+                    alpha = score
+                    self.pv[ply] = [m] + self.pv[ply + 1]
+                    if alpha >= beta:
+                        if not m & MV_CAPT:
+                            if self.killers[ply][0] != best_move:
+                                self.killers[ply] = [best_move, self.killers[ply][0]]
+                            self.history[best_move] = self.history.get(best_move, 0) + depth * depth
+                        break
+        if best <= alpha_orig:
+            flag = TableFlag.UPPER
+        elif best >= beta:
+            flag = TableFlag.LOWER
+        else:
+            flag = TableFlag.EXACT
+        t_score = best + ply if best > MATE_BOUND else best - ply if best < -MATE_BOUND else best
+        self.table.store(key, depth=depth, flag=flag, score=t_score, move=best_move)
+        return best
+
+    def _root(self, depth: int, moves: list[int], subset: bool = False):
+        self.pv[0] = []
+        self._tick()
+        key = self.engine.state.key
+        entry = self.table.probe(key)
+        best = -MATE_SCORE - 1
+        best_move = 0
+        for m in self._order(moves, ply=0, tt_move=entry[3] if entry is not None else 0):
+            # a move that would win a tie only has to match the best score, so ties always go to
+            # the lowest move value whatever order the moves are searched in
+            alpha = best - 1 if best_move and m < best_move else best
+            self.engine.make_move(m)
+            score = -self._negamax(depth - 1, -MATE_SCORE - 1, -alpha, 1)
+            self.engine.unmake_move()
+            if score > best or (score == best and m < best_move):
+                best = score
+                best_move = m
+                self.pv[0] = [m] + self.pv[1]
+        # the best of a subset only bounds the position from below, other moves may do better
+        self.table.store(key, depth=depth, flag=TableFlag.LOWER if subset else TableFlag.EXACT, score=best, move=best_move)
+        return best
+
+    def search(self, depth: int = 64, secs: float | None = None, moves: list[int] | None = None, mate_stop: bool = True):
+        """Iterative deepening over the legal root moves (or the given subset), every completed
+        iteration is kept in self.results and the deepest one is returned."""
+        undo_len = len(self.engine.undo)
+        t_start = time.perf_counter()
+        self.nodes = 0
+        self.deadline = None
+        self.results: list[SearchResult] = []
+        subset = moves is not None
+        if moves is None:
+            moves = self.engine.legal_moves()
+        if not moves:
+            score = -MATE_SCORE if self.engine.is_check else 0
+            return SearchResult(move=None, score=score, pv=[], depth=0, nodes=0, secs=0.0)
+        for d in range(1, depth + 1):
+            try:
+                score = self._root(d, moves, subset=subset)
+            except SearchTimeout:
+                while len(self.engine.undo) > undo_len:
+                    self.engine.unmake_move()
+                break
+            pv = list(self.pv[0])
+            self.results.append(SearchResult(move=pv[0], score=score, pv=pv, depth=d, nodes=self.nodes, secs=time.perf_counter() - t_start))
+            if mate_stop and score > MATE_BOUND:
+                break
+            # the first iteration always completes so there is a move to return
+            if secs is not None:
+                self.deadline = t_start + secs
+                if time.perf_counter() > self.deadline:
+                    break
+        result = self.results[-1]
+        result.nodes = self.nodes
+        result.secs = time.perf_counter() - t_start
+        return result
+
+
+def _search_worker(state: GameState, bitboards: bool, moves: list[int], depth: int, secs: float | None, table_mb: int):
+    search = GameSearch(engine=GameEngine(state=state, bitboards=bitboards), table=TransTable(size_mb=table_mb))
+    search.search(depth=depth, secs=secs, moves=moves, mate_stop=False)
+    return search.results
+
+
+def parallel_search(state: GameState, depth: int = 64, secs: float | None = None, workers: int | None = None, bitboards: bool = False, table_mb: int = 16):
+    """Root-split GameSearch over a process pool.
+
+    Every worker deepens over its own share of the root moves with its own table, and each depth
+    is combined with the same tie-break as GameSearch, so at a fixed depth the result matches the
+    single-process search.
+    """
+    t_start = time.perf_counter()
+    engine = GameEngine(state=state, bitboards=bitboards)
+    moves = sorted(engine.legal_moves())
+    workers = min(workers or os.cpu_count() or 1, len(moves))
+    if workers <= 1:
+        return GameSearch(engine=engine, table=TransTable(size_mb=table_mb)).search(depth=depth, secs=secs)
+    from concurrent.futures import ProcessPoolExecutor
+
+    shares = [moves[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        runs = list(pool.map(_search_worker, [state] * workers, [bitboards] * workers, shares, [depth] * workers, [secs] * workers, [table_mb] * workers))
+    result = None
+    for d in range(min(len(r) for r in runs)):
+        best = None
+        for r in runs:
+            if best is None or r[d].score > best.score or (r[d].score == best.score and r[d].move < best.move):
+                best = r[d]
+        result = SearchResult(move=best.move, score=best.score, pv=best.pv, depth=d + 1, nodes=0, secs=0.0)
+        if best.score > MATE_BOUND:
+            break
+    result.nodes = sum(r[-1].nodes for r in runs)
+    result.secs = time.perf_counter() - t_start
+    return result
 
 
 class GameUI:
@@ -292,7 +1071,14 @@ class GameUI:
         row_t = row + 1
         return f"{col_t}{str(row_t)}"
 
-    def move_text(self, board: list[list[PieceType]], move: GameMove):
+    def move_coord(self, move: int):
+        move = move_unpack(move)
+        src_t = self._pos_to_text(row=move.src_row, col=move.src_col)
+        tgt_t = self._pos_to_text(row=move.tgt_row, col=move.tgt_col)
+        return f"{src_t}{tgt_t}".lower()
+
+    def move_text(self, board: list[list[PieceType]], move: int):
+        move = move_unpack(move)
         src_p = board[move.src_row][move.src_col]
         src_p_sym = PIECE_UI[src_p]
         src_t = self._pos_to_text(row=move.src_row, col=move.src_col)
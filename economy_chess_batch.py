@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from economy_chess import GameEngine, GameSearch, GameUI, TransTable, dump_fen, parse_fen
+
+# one table per worker process, shared by every position it analyzes
+_table: TransTable | None = None
+
+
+def read_positions(path: str):
+    """Yield (line number, record) for every non-empty, non-comment line of a FEN/EPD file."""
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for i, line in enumerate(f, start=1):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield i, line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def analyze(line_no: int, record: str, depth: int, secs: float | None, bitboards: bool, table_mb: int):
+    global _table
+    # epd operations follow the four position fields, fen move counters are two plain numbers
+    fields = record.split(maxsplit=4)
+    ops = fields[4] if len(fields) > 4 and not fields[4].split()[0].isdigit() else ""
+    result = {"line": line_no, "fen": " ".join(fields[:4])}
+    for op in ops.split(";"):
+        if op.strip().startswith("id "):
+            result["id"] = op.strip()[3:].strip().strip('"')
+    try:
+        state = parse_fen(record)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    # any failure on one record becomes its error line instead of stopping the batch
+    try:
+        engine = GameEngine(state=state, bitboards=bitboards)
+        ui = GameUI()
+        result["fen"] = dump_fen(state)
+        result["moves"] = len(engine.legal_moves())
+        result["check"] = engine.is_check
+        if _table is None:
+            _table = TransTable(size_mb=table_mb)
+        # entries left by the previous position would cut the search short and make pv and nodes depend on record order
+        _table.clear()
+        search = GameSearch(engine=engine, table=_table)
+        found = search.search(depth=depth, secs=secs)
+        result["best"] = ui.move_coord(found.move) if found.move is not None else None
+        result["score"] = found.score
+        result["depth"] = found.depth
+        result["pv"] = [ui.move_coord(m) for m in found.pv]
+        result["nodes"] = found.nodes
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_batch(path: str, out, depth: int, secs: float | None, workers: int, inflight: int, bitboards: bool, table_mb: int):
+    """Analyze positions on a process pool, keeping at most `inflight` positions queued and writing results in input order."""
+    done = 0
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for line_no, record in read_positions(path):
+            pending.append(pool.submit(analyze, line_no, record, depth, secs, bitboards, table_mb))
+            if len(pending) >= inflight:
+                out.write(json.dumps(pending.popleft().result()) + "\n")
+                done += 1
+        while pending:
+            out.write(json.dumps(pending.popleft().result()) + "\n")
+            done += 1
+    out.flush()
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="economy chess batch analyzer: FEN/EPD lines in, JSONL results out")
+    parser.add_argument("input", help="FEN/EPD file, - for stdin")
+    parser.add_argument("--output", default="-", help="JSONL output file, - for stdout")
+    parser.add_argument("--depth", type=int, default=4, help="search depth per position")
+    parser.add_argument("--secs", type=float, default=None, help="search time budget per position")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--inflight", type=int, default=None, help="maximum positions queued at once (default 4 per worker)")
+    parser.add_argument("--table-mb", type=int, default=16, help="transposition table size per worker")
+    parser.add_argument("--bitboards", action="store_true", help="use the bitboard backend")
+    args = parser.parse_args()
+    inflight = args.inflight or 4 * args.workers
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run_batch(
+            path=args.input,
+            out=out,
+            depth=args.depth,
+            secs=args.secs,
+            workers=args.workers,
+            inflight=inflight,
+            bitboards=args.bitboards,
+            table_mb=args.table_mb,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import sys
+import time
+from economy_chess import GameEngine, GameUI, parse_fen
+
+# (name, fen, pseudo-legal and legal node counts for depth 1, 2, ...)
+# economy chess has no castling or promotion, so legal counts only follow standard perft while
+# neither comes into play (start position up to depth 4, endgame up to depth 5)
+PERFT_POSITIONS: list[tuple[str, str, list[int], list[int]]] = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1", [20, 400, 8902, 197742], [20, 400, 8902, 197281]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w - - 0 1", [46, 1871, 87310], [46, 1866, 86677]),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [16, 278, 4867, 90159], [14, 191, 2812, 43238, 674624]),
+    ("enpassant", "rnbqkbnr/pp1p1ppp/8/2pPp3/8/8/PPP1PPPP/RNBQKBNR w - e6 0 1", [30, 841, 25609, 737016], [30, 839, 24782, 702209]),
+]
+
+
+def perft(engine: GameEngine, depth: int, legal: bool = False) -> int:
+    moves = engine.legal_moves() if legal else engine._pseudo_legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for m in moves:
+        engine.make_move(m)
+        nodes += perft(engine=engine, depth=depth - 1, legal=legal)
+        engine.unmake_move()
+    return nodes
+
+
+def divide(engine: GameEngine, depth: int, legal: bool = False) -> list[tuple[int, int]]:
+    counts: list[tuple[int, int]] = []
+    for m in engine.legal_moves() if legal else engine._pseudo_legal_moves():
+        engine.make_move(m)
+        counts.append((m, perft(engine=engine, depth=depth - 1, legal=legal)))
+        engine.unmake_move()
+    return counts
+
+
+def run_suite(max_depth: int, bitboards: bool, legal: bool = False, names: list[str] | None = None):
+    failed = 0
+    tot_nodes = 0
+    tot_secs = 0.0
+    for name, fen, counts, legal_counts in PERFT_POSITIONS:
+        if names and name not in names:
+            continue
+        engine = GameEngine(state=parse_fen(fen), bitboards=bitboards)
+        for depth, expected in enumerate((legal_counts if legal else counts)[:max_depth], start=1):
+            t_start = time.perf_counter()
+            nodes = perft(engine=engine, depth=depth, legal=legal)
+            secs = time.perf_counter() - t_start
+            tot_nodes += nodes
+            tot_secs += secs
+            status = "ok" if nodes == expected else f"FAIL (expected {expected})"
+            failed += nodes != expected
+            print(f"{name:<10} depth {depth}  nodes {nodes:>10}  {nodes / max(secs, 1e-9):>10.0f} nps  {status}")
+    print(f"total nodes {tot_nodes}  {tot_nodes / max(tot_secs, 1e-9):.0f} nps")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="economy chess perft: move generation correctness and throughput")
+    parser.add_argument("--depth", type=int, default=3, help="maximum depth to run")
+    parser.add_argument("--bitboards", action="store_true", help="use the bitboard backend")
+    parser.add_argument("--position", action="append", help="restrict to the named reference position(s)")
+    parser.add_argument("--legal", action="store_true", help="count legal instead of pseudo-legal moves")
+    parser.add_argument("--divide", action="store_true", help="print per root move node counts at --depth")
+    args = parser.parse_args()
+    if not args.divide:
+        sys.exit(1 if run_suite(max_depth=args.depth, bitboards=args.bitboards, legal=args.legal, names=args.position) else 0)
+    ui = GameUI()
+    for name, fen, _, _ in PERFT_POSITIONS:
+        if args.position and name not in args.position:
+            continue
+        engine = GameEngine(state=parse_fen(fen), bitboards=args.bitboards)
+        print(name)
+        t_start = time.perf_counter()
+        counts = divide(engine=engine, depth=args.depth, legal=args.legal)
+        secs = time.perf_counter() - t_start
+        for m, nodes in counts:
+            print(f"  {ui.move_text(board=engine.state.board, move=m)}: {nodes}")
+        nodes = sum(n for _, n in counts)
+        print(f"  total {nodes}  {nodes / max(secs, 1e-9):.0f} nps")
+
+
+if __name__ == "__main__":
+    main()
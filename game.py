@@ -1,7 +1,19 @@
+import argparse
 import json
-import colorama
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from enum import IntEnum
-from openai import OpenAI
+from typing import TYPE_CHECKING
+from instrument import METRICS
+
+# openai and colorama load on first use, keeping start-up fast for local play
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
 class TileType(IntEnum):
@@ -11,6 +23,11 @@ class TileType(IntEnum):
 
 
 BOARD_SIZE = 3
+# exhaustive solving: 3x3 solves in well under a second, 4x4 takes minutes, anything bigger never finishes
+SOLVER_MAX_TILES = 16
+SOLVER_FAST_TILES = 9
+# top-down, left-right, top left - bottom right, top right - bottom left
+LINE_DIRS = [(1, 0), (0, 1), (1, 1), (1, -1)]
 MODEL_NAME = "gpt-5"
 TILE_ICONS = {
     TileType.V: "□",
@@ -22,6 +39,31 @@ TILE_ICONS = {
 class InvalidMoveError(ValueError): ...
 
 
+def board_symmetries(size: int):
+    """Index maps of the 8 rotations and reflections of a square board, transformed[i] = flat[perm[i]]."""
+    n = size - 1
+    coords = [
+        lambda r, c: (r, c),
+        lambda r, c: (n - c, r),
+        lambda r, c: (n - r, n - c),
+        lambda r, c: (c, n - r),
+        lambda r, c: (r, n - c),
+        lambda r, c: (n - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (n - c, n - r),
+    ]
+    perms: list[tuple[int, ...]] = []
+    for coord in coords:
+        perms.append(tuple(src_r * size + src_c for src_r, src_c in (coord(r, c) for r in range(size) for c in range(size))))
+    return perms
+
+
+def canonical_board(board: list[list[TileType]], perms: list[tuple[int, ...]]):
+    """Smallest symmetric image of the board and the index map that produces it."""
+    flat = [t for row in board for t in row]
+    return min((tuple(flat[i] for i in perm), perm) for perm in perms)
+
+
 class GameMove:
     def __init__(self, row: int, col: int):
         self.row = row
@@ -29,8 +71,11 @@ class GameMove:
 
 
 class GameEngine:
-    def __init__(self):
-        self.board = [[TileType.V for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    def __init__(self, size: int = BOARD_SIZE, win_len: int | None = None):
+        self.size = size
+        self.win_len = win_len if win_len is not None else size
+        self.board = [[TileType.V for _ in range(size)] for _ in range(size)]
+        self.vacant = size * size
         self.last_move: GameMove | None = None
         self.is_over: bool = False
         self.is_draw: bool = False
@@ -40,80 +85,24 @@ class GameEngine:
         last_move_row = self.last_move.row
         last_move_col = self.last_move.col
 
-        # scan top-down ray crossing last move
-        td_ray_leng = 0
-        td_ray_full = True
-        td_r = 0
-        td_c = last_move_col
-        while td_r in range(BOARD_SIZE):
-            if self.board[td_r][td_c] != self.turn:
-                td_ray_full = False
-                break
-            td_ray_leng += 1
-            td_r += 1
-
-        # scan top left - bottom right ray crossing last move
-        tlbr_ray_leng = 0
-        tlbr_ray_full = True
-        tlbr_r = last_move_row
-        tlbr_c = last_move_col
-        while tlbr_r in range(1, BOARD_SIZE) and tlbr_c in range(1, BOARD_SIZE):
-            tlbr_r -= 1
-            tlbr_c -= 1
-        while tlbr_r in range(BOARD_SIZE) and tlbr_c in range(BOARD_SIZE):
-            if self.board[tlbr_r][tlbr_c] != self.turn:
-                tlbr_ray_full = False
-                break
-            tlbr_ray_leng += 1
-            tlbr_r += 1
-            tlbr_c += 1
-
-        # scan top right - bottom left ray crossing last move
-        trbl_ray_leng = 0
-        trbl_ray_full = True
-        trbl_r = last_move_row
-        trbl_c = last_move_col
-        while trbl_r in range(1, BOARD_SIZE) and trbl_c in range(BOARD_SIZE):
-            trbl_r -= 1
-            trbl_c += 1
-        while trbl_r in range(BOARD_SIZE) and trbl_c in range(BOARD_SIZE):
-            if self.board[trbl_r][trbl_c] != self.turn:
-                trbl_ray_full = False
-                break
-            trbl_ray_leng += 1
-            trbl_r += 1
-            trbl_c -= 1
-
-        # scan left-right ray crossing last move
-        lr_ray_leng = 0
-        lr_ray_full = True
-        lr_r = last_move_row
-        lr_c = 0
-        while lr_c in range(BOARD_SIZE):
-            if self.board[lr_r][lr_c] != self.turn:
-                lr_ray_full = False
-                break
-            lr_ray_leng += 1
-            lr_c += 1
-
-        # need to be at least board size length to win
-        td_ray_win = td_ray_full and td_ray_leng >= BOARD_SIZE
-        tlbr_ray_win = tlbr_ray_full and tlbr_ray_leng >= BOARD_SIZE
-        trbl_ray_win = trbl_ray_full and trbl_ray_leng >= BOARD_SIZE
-        lr_ray_win = lr_ray_full and lr_ray_leng >= BOARD_SIZE
-
-        # check if any of the rays are winning
-        if any([td_ray_win, tlbr_ray_win, trbl_ray_win, lr_ray_win]):
-            self.is_over = True
-            return
+        # count the run of current turn tiles through the last move on each line, both ways out
+        for r_off, c_off in LINE_DIRS:
+            run_leng = 1
+            for sgn in (1, -1):
+                r = last_move_row + sgn * r_off
+                c = last_move_col + sgn * c_off
+                while 0 <= r < self.size and 0 <= c < self.size and self.board[r][c] == self.turn and run_leng < self.win_len:
+                    run_leng += 1
+                    r += sgn * r_off
+                    c += sgn * c_off
+
+            # need to be at least win length to win
+            if run_leng >= self.win_len:
+                self.is_over = True
+                return
 
         # no moves + no win = draw
-        vacant_tiles = 0
-        for r in self.board:
-            for c in r:
-                if c == TileType.V:
-                    vacant_tiles += 1
-        if not vacant_tiles:
+        if not self.vacant:
             self.is_over = self.is_draw = True
             return
 
@@ -121,7 +110,7 @@ class GameEngine:
         self.turn = TileType.X if self.turn == TileType.O else TileType.O
 
     def is_legal_move(self, move: GameMove):
-        if move.row not in range(BOARD_SIZE) or move.col not in range(BOARD_SIZE):
+        if move.row not in range(self.size) or move.col not in range(self.size):
             return False
         if self.board[move.row][move.col] != TileType.V:
             return False
@@ -129,26 +118,264 @@ class GameEngine:
 
     def make_move(self, move: GameMove):
         self.board[move.row][move.col] = self.turn
+        self.vacant -= 1
         self.last_move = move
         self.evaluate_board()
         if not self.is_over:
             self.swap_turns()
 
+    def undo_move(self, move: GameMove):
+        if not self.is_over:
+            self.swap_turns()
+        self.board[move.row][move.col] = TileType.V
+        self.vacant += 1
+        self.last_move = None
+        self.is_over = self.is_draw = False
+
+    def copy(self):
+        engine = GameEngine(size=self.size, win_len=self.win_len)
+        engine.board = [row[:] for row in self.board]
+        engine.vacant = self.vacant
+        engine.last_move = self.last_move
+        engine.is_over = self.is_over
+        engine.is_draw = self.is_draw
+        engine.turn = self.turn
+        return engine
+
+
+class GameSolver:
+    """Perfect play by memoized negamax, keyed by the canonical board under the 8 square symmetries.
+
+    The table stores the score for the side to move and the best move in canonical coordinates.
+    Solving is exhaustive, so boards over SOLVER_MAX_TILES tiles are refused; by default only boards up to
+    SOLVER_FAST_TILES are solved up front, bigger ones are solved lazily from the first position asked.
+    """
+
+    def __init__(self, size: int = BOARD_SIZE, win_len: int | None = None, precompute: bool | None = None):
+        if size * size > SOLVER_MAX_TILES:
+            raise ValueError(f"solver is limited to {SOLVER_MAX_TILES} tiles, got a {size}x{size} board")
+        if precompute is None:
+            precompute = size * size <= SOLVER_FAST_TILES
+        self.size = size
+        self.perms = board_symmetries(size)
+        self.table: dict[tuple[TileType, tuple[int, ...]], tuple[int, int]] = {}
+        if precompute:
+            self.solve(GameEngine(size=size, win_len=win_len))
+
+    def solve(self, engine: GameEngine):
+        tiles, perm = canonical_board(engine.board, self.perms)
+        key = (engine.turn, tiles)
+        if key in self.table:
+            return self.table[key][0]
+        best_score = best_idx = None
+        for i, src in enumerate(perm):
+            if tiles[i] != TileType.V:
+                continue
+            move = GameMove(row=src // self.size, col=src % self.size)
+            engine.make_move(move=move)
+            if engine.is_draw:
+                score = 0
+            elif engine.is_over:
+                # sooner wins score higher
+                score = engine.vacant + 1
+            else:
+                score = -self.solve(engine)
+            engine.undo_move(move=move)
+            if best_score is None or score > best_score:
+                best_score, best_idx = score, i
+        self.table[key] = (best_score, best_idx)
+        return best_score
+
+    def suggest_move(self, engine: GameEngine):
+        tiles, perm = canonical_board(engine.board, self.perms)
+        key = (engine.turn, tiles)
+        if key not in self.table:
+            self.solve(engine.copy())
+        src = perm[self.table[key][1]]
+        return src // self.size, src % self.size
+
+
+class GameRandom:
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+
+    def suggest_move(self, engine: GameEngine):
+        return self.rng.choice([(r, c) for r in range(engine.size) for c in range(engine.size) if engine.board[r][c] == TileType.V])
+
+
+class LogWriter:
+    """Appends text to a file from a background thread, flushing at most `flush_secs` after a write and on close."""
+
+    def __init__(self, path: str, flush_secs: float = 1.0):
+        self.path = path
+        self.flush_secs = flush_secs
+        self.queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        with open(self.path, "a") as f:
+            # deadline of the oldest unflushed write, also under a steady stream of writes
+            flush_at: float | None = None
+            while True:
+                try:
+                    text = self.queue.get(timeout=None if flush_at is None else max(0.0, flush_at - time.monotonic()))
+                except queue.Empty:
+                    text = ""
+                if text is None:
+                    return
+                if text:
+                    f.write(text)
+                    if flush_at is None:
+                        flush_at = time.monotonic() + self.flush_secs
+                if flush_at is not None and time.monotonic() >= flush_at:
+                    f.flush()
+                    flush_at = None
+
+    def write(self, text: str):
+        self.queue.put(text)
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+class MoveCache:
+    """LRU of validated moves keyed by (size, win length, turn, canonical board), backed by an append-only jsonl file.
+
+    Moves are stored as canonical board indexes, so one entry serves all 8 symmetric positions.
+    Every open cache holds a shared lock on `path`.lock, and the file is only compacted under an exclusive
+    one, so caches opened by several processes at once (selfplay workers) never rewrite it under each other.
+    """
+
+    def __init__(self, path: str | None = "ai.cache.jsonl", max_size: int = 4096):
+        self.path = path
+        self.max_size = max_size
+        self.table: OrderedDict[tuple[int, int, int, tuple[int, ...]], int] = OrderedDict()
+        self.hits = self.misses = 0
+        self.writer: LogWriter | None = None
+        self.lock_file = None
+        # speculative lookups run on worker threads
+        self.lock = threading.Lock()
+        if path is None:
+            return
+        can_compact = self._file_lock()
+        lines = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        e = json.loads(line)
+                        self._put((e["size"], e["win_len"], e["turn"], tuple(e["tiles"])), e["idx"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    lines += 1
+        # rewrite the file once evictions or duplicates leave it bigger than the table
+        if can_compact and lines > len(self.table):
+            with open(path + ".tmp", "w") as f:
+                for key, idx in self.table.items():
+                    f.write(self._dump(key, idx))
+            os.replace(path + ".tmp", path)
+        if can_compact:
+            import fcntl
+
+            fcntl.flock(self.lock_file, fcntl.LOCK_SH)
+        self.writer = LogWriter(path)
+
+    def _file_lock(self):
+        """Take the lock file, exclusively when no other process has the cache open; True if exclusive."""
+        try:
+            import fcntl
+        except ImportError:
+            # no advisory locks here, so never compact
+            return False
+        self.lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            fcntl.flock(self.lock_file, fcntl.LOCK_SH)
+            return False
+
+    @staticmethod
+    def _dump(key: tuple[int, int, int, tuple[int, ...]], idx: int):
+        size, win_len, turn, tiles = key
+        return json.dumps({"size": size, "win_len": win_len, "turn": turn, "tiles": list(tiles), "idx": idx}) + "\n"
+
+    def _put(self, key: tuple[int, int, int, tuple[int, ...]], idx: int):
+        self.table[key] = idx
+        self.table.move_to_end(key)
+        if len(self.table) > self.max_size:
+            self.table.popitem(last=False)
+
+    def get(self, key: tuple[int, int, int, tuple[int, ...]]):
+        with self.lock:
+            idx = self.table.get(key)
+            if idx is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.table.move_to_end(key)
+            return idx
+
+    def put(self, key: tuple[int, int, int, tuple[int, ...]], idx: int):
+        with self.lock:
+            self._put(key, idx)
+        if self.writer is not None:
+            self.writer.write(self._dump(key, idx))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
 
 class GameAI:
-    def __init__(self, client: OpenAI):
+    def __init__(self, client: "OpenAI | None" = None, cache: MoveCache | None = None, log_path: str = "ai.resp.log"):
         self.system_chat = {"role": "system", "content": 'you must return json containing best move coordinate in tic-tac-toe based on board representation and turn provided. example: {"r": 0, "c": 2}'}
-        self.client = client
-
-    def suggest_move(self, board: str, turn: TileType):
-        messages = [self.system_chat, {"role": "user", "content": f"board: {board}\nturn: {turn.value}"}]
-        resp = self.client.chat.completions.create(model=MODEL_NAME, messages=messages)
+        self._client = client
+        self.cache = cache if cache is not None else MoveCache()
+        self.log = LogWriter(log_path)
+        self.perms: dict[int, list[tuple[int, ...]]] = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            from chat import default_client
+
+            self._client = default_client()
+        return self._client
+
+    def suggest_move(self, engine: GameEngine):
+        if engine.size not in self.perms:
+            self.perms[engine.size] = board_symmetries(engine.size)
+        tiles, perm = canonical_board(engine.board, self.perms[engine.size])
+        key = (engine.size, engine.win_len, int(engine.turn), tuple(int(t) for t in tiles))
+        idx = self.cache.get(key)
+        if idx is not None:
+            src = perm[idx]
+            return src // engine.size, src % engine.size
+        board = GameUI().dump_board(board=engine.board)
+        messages = [self.system_chat, {"role": "user", "content": f"board: {board}\nturn: {engine.turn.value}"}]
+        with METRICS.track(source="game", model=MODEL_NAME) as call:
+            resp = self.client.chat.completions.create(model=MODEL_NAME, messages=messages)
+            call.usage(resp.usage)
         resp_text_raw = resp.choices[0].message.content
-        with open("ai.resp.log", "a") as f:
-            f.write(str(resp.model_dump()) + "\n\n")
+        self.log.write(str(resp.model_dump()) + "\n\n")
         resp_text = resp_text_raw.replace("```json\n", "").replace("\n```", "")
         resp_dict = json.loads(resp_text)
-        return int(resp_dict.get("r")), int(resp_dict.get("c"))
+        r, c = int(resp_dict.get("r")), int(resp_dict.get("c"))
+        # only legal suggestions are remembered, the caller still reports illegal ones
+        if engine.is_legal_move(move=GameMove(row=r, col=c)):
+            self.cache.put(key, perm.index(r * engine.size + c))
+        return r, c
+
+    def close(self):
+        self.log.close()
+        self.cache.close()
 
 
 class GameUI:
@@ -157,12 +384,14 @@ class GameUI:
 
     def dump_board(self, board: list[list[TileType]]):
         text = "\n"
-        for r in range(BOARD_SIZE):
+        size = len(board)
+        width = len(str(size - 1))
+        for r in range(size):
             if r == 0:
-                header = " ".join([str(i) for i in range(BOARD_SIZE)])
-                text += f"  {header}\n"
-            row = " ".join([TILE_ICONS[t] for t in board[r]])
-            text += f"{r} {row}\n"
+                header = " ".join([str(i).rjust(width) for i in range(size)])
+                text += f"{' ' * width} {header}\n"
+            row = " ".join([TILE_ICONS[t].rjust(width) for t in board[r]])
+            text += f"{str(r).rjust(width)} {row}\n"
         return text
 
     def draw_board(self, board: list[list[TileType]]):
@@ -170,10 +399,14 @@ class GameUI:
         print(text)
 
     def draw_error(self, text: str):
+        import colorama
+
         print(colorama.Fore.RED + f"\n{text}\n")
         print(colorama.Style.RESET_ALL)
 
     def draw_alert(self, text: str):
+        import colorama
+
         print(colorama.Fore.YELLOW + f"\n{text}\n")
         print(colorama.Style.RESET_ALL)
 
@@ -183,31 +416,146 @@ class GameUI:
         return row_input, col_input
 
 
+class GameSpeculator:
+    """Precomputes ai replies to the likeliest human moves on worker threads while the human is deciding.
+
+    Replies are kept for the current turn only, keyed by the board after the human move. A failed guess
+    counts as a miss. Workers are daemon threads rather than a ThreadPoolExecutor, whose exit hook
+    would hold the process open until in-flight remote calls return.
+    """
+
+    def __init__(self, ai: GameAI | GameSolver | GameRandom, moves: int | None = 4, workers: int = 4):
+        self.ai = ai
+        self.moves = moves
+        self.queue: queue.SimpleQueue[tuple[Future, GameEngine] | None] = queue.SimpleQueue()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+        self.board: tuple[int, ...] | None = None
+        self.replies: dict[tuple[int, ...], Future] = {}
+        self.hits = self.misses = self.errors = 0
+
+    def _work(self):
+        while (item := self.queue.get()) is not None:
+            future, engine = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.ai.suggest_move(engine=engine))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _submit(self, engine: GameEngine):
+        future = Future()
+        self.queue.put((future, engine))
+        return future
+
+    @staticmethod
+    def _key(engine: GameEngine):
+        return tuple(int(t) for row in engine.board for t in row)
+
+    @staticmethod
+    def _likely_moves(engine: GameEngine):
+        # next to existing tiles first, then closest to the centre
+        n = engine.size
+        mid = (n - 1) / 2
+
+        def rank(move: GameMove):
+            near = any(
+                engine.board[r][c] != TileType.V
+                for r in range(max(0, move.row - 1), min(n, move.row + 2))
+                for c in range(max(0, move.col - 1), min(n, move.col + 2))
+            )
+            return not near, abs(move.row - mid) + abs(move.col - mid)
+
+        moves = [GameMove(row=r, col=c) for r in range(n) for c in range(n) if engine.board[r][c] == TileType.V]
+        return sorted(moves, key=rank)
+
+    def start(self, engine: GameEngine):
+        """Queue replies to the likely human moves from this position, once per position."""
+        board = self._key(engine)
+        if board == self.board:
+            return
+        self.clear()
+        self.board = board
+        moves = self._likely_moves(engine)
+        for move in moves if self.moves is None else moves[: self.moves]:
+            after = engine.copy()
+            after.make_move(move=move)
+            if not after.is_over:
+                self.replies[self._key(after)] = self._submit(engine=after)
+
+    def take(self, engine: GameEngine):
+        """The precomputed reply to this position, waiting for it if still running, None on a miss or a failed guess."""
+        future = self.replies.pop(self._key(engine), None)
+        self.clear()
+        if future is None:
+            self.misses += 1
+            return None
+        try:
+            reply = future.result()
+        except Exception:
+            # the caller asks the ai directly, as on a miss
+            self.errors += 1
+            return None
+        self.hits += 1
+        return reply
+
+    def clear(self):
+        for future in self.replies.values():
+            future.cancel()
+        self.replies = {}
+        self.board = None
+
+    def close(self):
+        self.clear()
+        for _ in self.workers:
+            self.queue.put(None)
+
+
 class Game:
-    def __init__(self, engine: GameEngine, ai: GameAI, ui: GameUI):
+    def __init__(
+        self,
+        engine: GameEngine,
+        ai: GameAI | GameSolver | GameRandom,
+        ui: GameUI,
+        ai_turn: TileType | None = TileType.O,
+        speculator: GameSpeculator | None = None,
+    ):
         self.engine = engine
         self.ai = ai
         self.ui = ui
-        self.ai_turn = TileType.O
+        self.ai_turn = ai_turn
+        self.speculator = speculator
 
     def start(self):
+        try:
+            self._loop()
+        finally:
+            if self.speculator is not None:
+                self.speculator.close()
+
+    def _loop(self):
         # first draw
         self.ui.draw_board(board=self.engine.board)
 
         # main game loop
         while True:
-            ai_move = False  # ai vs self mode
+            ai_move = self.engine.turn == self.ai_turn
 
             # process inputs
             if ai_move:
                 # ai input
                 try:
-                    move_row, move_col = self.ai.suggest_move(board=self.ui.dump_board(board=self.engine.board), turn=self.engine.turn)
+                    reply = self.speculator.take(engine=self.engine) if self.speculator is not None else None
+                    move_row, move_col = reply if reply is not None else self.ai.suggest_move(engine=self.engine)
                 except Exception as e:
                     self.ui.draw_error(f"input error: {e}")
                     break
             else:
-                # human input
+                # human input, the ai thinks ahead meanwhile
+                if self.speculator is not None and self.ai_turn is not None:
+                    self.speculator.start(engine=self.engine)
                 try:
                     move_row, move_col = self.ui.move_input()
                 except Exception as e:
@@ -240,9 +588,124 @@ class Game:
                 break
 
 
-if __name__ == "__main__":
-    engine = GameEngine()
-    ai = GameAI(client=OpenAI())
+PLAYERS = ("solver", "random", "remote")
+
+
+def default_player(size: int):
+    """Perfect local play where it answers instantly, random moves on bigger boards."""
+    return "solver" if size * size <= SOLVER_FAST_TILES else "random"
+
+
+def make_player(name: str, size: int, win_len: int | None, seed: int | None = None):
+    match name:
+        case "solver":
+            return GameSolver(size=size, win_len=win_len)
+        case "random":
+            return GameRandom(seed=seed)
+        case "remote":
+            return GameAI()
+    raise ValueError(f"unknown player: {name}")
+
+
+def play_headless(engine: GameEngine, players: dict[TileType, GameAI | GameSolver | GameRandom]):
+    """Play one game to the end without a UI, returns the winner (V on a draw) and every move latency in seconds."""
+    latencies: list[float] = []
+    while not engine.is_over:
+        t_start = time.perf_counter()
+        try:
+            move = GameMove(*players[engine.turn].suggest_move(engine=engine))
+        except Exception:
+            move = None
+        latencies.append(time.perf_counter() - t_start)
+        # a failed or illegal suggestion forfeits the game
+        if move is None or not engine.is_legal_move(move=move):
+            return (TileType.X if engine.turn == TileType.O else TileType.O), latencies
+        engine.make_move(move=move)
+    return (TileType.V if engine.is_draw else engine.turn), latencies
+
+
+def _play_games(x_name: str, o_name: str, games: int, size: int, win_len: int | None, seed: int):
+    x_player = make_player(name=x_name, size=size, win_len=win_len, seed=seed)
+    o_player = x_player if o_name == x_name == "solver" else make_player(name=o_name, size=size, win_len=win_len, seed=seed + 1)
+    players = {TileType.X: x_player, TileType.O: o_player}
+    wins = {t: 0 for t in TileType}
+    latencies: list[float] = []
+    for _ in range(games):
+        winner, game_latencies = play_headless(engine=GameEngine(size=size, win_len=win_len), players=players)
+        wins[winner] += 1
+        latencies += game_latencies
+    for player in {id(x_player): x_player, id(o_player): o_player}.values():
+        if isinstance(player, GameAI):
+            player.close()
+    return wins, latencies
+
+
+def run_tournament(x_name: str, o_name: str, games: int, workers: int, size: int = BOARD_SIZE, win_len: int | None = None, seed: int = 0, chunk: int = 100):
+    from concurrent.futures import ProcessPoolExecutor
+
+    t_start = time.perf_counter()
+    wins = {t: 0 for t in TileType}
+    latencies: list[float] = []
+    chunks = [min(chunk, games - i) for i in range(0, games, chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_play_games, x_name, o_name, n, size, win_len, seed + 2 * i) for i, n in enumerate(chunks)]
+        for future in futures:
+            chunk_wins, chunk_latencies = future.result()
+            for t, n in chunk_wins.items():
+                wins[t] += n
+            latencies += chunk_latencies
+    secs = time.perf_counter() - t_start
+    latencies.sort()
+
+    def percentile(q: float):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e6 if latencies else 0.0
+
+    return {
+        "games": games,
+        "secs": secs,
+        "games_per_sec": games / secs if secs > 0 else 0.0,
+        "x_win_rate": wins[TileType.X] / games if games else 0.0,
+        "o_win_rate": wins[TileType.O] / games if games else 0.0,
+        "draw_rate": wins[TileType.V] / games if games else 0.0,
+        "moves": len(latencies),
+        "move_us_p50": percentile(0.5),
+        "move_us_p90": percentile(0.9),
+        "move_us_p99": percentile(0.99),
+        "move_us_max": percentile(1.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="n x n k-in-a-row")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board size")
+    parser.add_argument("--win-len", type=int, default=None, help="tiles in a row to win, board size by default")
+    parser.add_argument("--remote", action="store_true", help="play against the remote model instead of the local ai")
+    parser.add_argument("--selfplay", type=int, default=0, help="play this many headless ai vs ai games and report stats")
+    parser.add_argument("--x", default=None, choices=PLAYERS, help="selfplay move provider for x, solver on 3x3 and random above by default")
+    parser.add_argument("--o", default="random", choices=PLAYERS, help="selfplay move provider for o")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="selfplay worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="selfplay random seed")
+    parser.add_argument("--metrics", default=None, help="write model call metrics here on exit, prometheus text for .prom, json otherwise")
+    parser.add_argument("--speculate", type=int, default=4, help="ai replies to precompute while you think, 0 disables, -1 for every move")
+    args = parser.parse_args()
+    if args.selfplay:
+        stats = run_tournament(x_name=args.x or default_player(args.size), o_name=args.o, games=args.selfplay, workers=args.workers, size=args.size, win_len=args.win_len, seed=args.seed)
+        print(json.dumps(stats, indent=2))
+        return
+    engine = GameEngine(size=args.size, win_len=args.win_len)
+    # local play by default, the remote model on request
+    ai = GameAI() if args.remote else make_player(name=default_player(engine.size), size=engine.size, win_len=engine.win_len)
     ui = GameUI()
-    game = Game(engine=engine, ai=ai, ui=ui)
-    game.start()
+    speculator = GameSpeculator(ai=ai, moves=None if args.speculate < 0 else args.speculate) if args.speculate else None
+    game = Game(engine=engine, ai=ai, ui=ui, speculator=speculator)
+    try:
+        game.start()
+    finally:
+        if isinstance(ai, GameAI):
+            ai.close()
+        if args.metrics:
+            METRICS.dump(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
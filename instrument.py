@@ -0,0 +1,174 @@
+import json
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable
+
+# seconds, roughly doubling from a cache hit to a slow reasoning reply
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float):
+        """Upper bound of the bucket holding the q-th observation, inf past the last bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class CallStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.ttft = Histogram()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class ModelCall:
+    """One timed model call, filled in by the caller and recorded when the `with` block ends."""
+
+    def __init__(self, metrics: "Metrics", source: str, model: str):
+        self.metrics = metrics
+        self.source = source
+        self.model = model
+        self.t_start = perf_counter()
+        self.secs: float | None = None
+        self.ttft: float | None = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.error: str | None = None
+
+    def first_token(self):
+        if self.ttft is None:
+            self.ttft = perf_counter() - self.t_start
+
+    def usage(self, usage):
+        if usage is None:
+            return
+        self.prompt_tokens += usage.prompt_tokens or 0
+        self.completion_tokens += usage.completion_tokens or 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.secs = perf_counter() - self.t_start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.metrics.record(self)
+        return False
+
+
+class Metrics:
+    """Per (source, model) latency histograms and call, error, retry and token counters, with hooks called on every call."""
+
+    def __init__(self):
+        self.stats: dict[tuple[str, str], CallStats] = {}
+        self.hooks: list[Callable[[ModelCall], None]] = []
+        self.lock = threading.Lock()
+
+    def track(self, source: str, model: str):
+        return ModelCall(metrics=self, source=source, model=model)
+
+    def _stats(self, source: str, model: str):
+        key = (source, str(model))
+        if key not in self.stats:
+            self.stats[key] = CallStats()
+        return self.stats[key]
+
+    def record(self, call: ModelCall):
+        with self.lock:
+            stats = self._stats(call.source, call.model)
+            stats.calls += 1
+            stats.errors += call.error is not None
+            stats.latency.observe(call.secs)
+            if call.ttft is not None:
+                stats.ttft.observe(call.ttft)
+            stats.prompt_tokens += call.prompt_tokens
+            stats.completion_tokens += call.completion_tokens
+        for hook in self.hooks:
+            hook(call)
+
+    def retry(self, source: str, model: str):
+        with self.lock:
+            self._stats(source, model).retries += 1
+
+    def snapshot(self):
+        with self.lock:
+            return [
+                {
+                    "source": source,
+                    "model": model,
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "retries": s.retries,
+                    "prompt_tokens": s.prompt_tokens,
+                    "completion_tokens": s.completion_tokens,
+                    "latency_sum": s.latency.sum,
+                    "latency_p50": s.latency.quantile(0.5),
+                    "latency_p99": s.latency.quantile(0.99),
+                    "ttft_p50": s.ttft.quantile(0.5),
+                    "ttft_p99": s.ttft.quantile(0.99),
+                }
+                for (source, model), s in self.stats.items()
+            ]
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        lines: list[str] = []
+        counters = [
+            ("model_calls_total", "calls", "model calls"),
+            ("model_errors_total", "errors", "model calls that raised"),
+            ("model_retries_total", "retries", "model call retries"),
+            ("model_prompt_tokens_total", "prompt_tokens", "prompt tokens reported by the api"),
+            ("model_completion_tokens_total", "completion_tokens", "completion tokens reported by the api"),
+        ]
+        with self.lock:
+            for name, attr, text in counters:
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} counter"]
+                for (source, model), s in self.stats.items():
+                    lines.append(f'{name}{{source="{source}",model="{model}"}} {getattr(s, attr)}')
+            for name, attr, text in [("model_call_seconds", "latency", "model call wall clock latency"), ("model_ttft_seconds", "ttft", "time to first streamed token")]:
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} histogram"]
+                for (source, model), s in self.stats.items():
+                    hist: Histogram = getattr(s, attr)
+                    labels = f'source="{source}",model="{model}"'
+                    seen = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        seen += n
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {seen}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Write Prometheus text for a .prom path, a JSON snapshot otherwise."""
+        with open(path, "w") as f:
+            f.write(self.to_prometheus() if path.endswith(".prom") else self.to_json())
+
+
+# process-wide registry shared by the chat and game model calls
+METRICS = Metrics()